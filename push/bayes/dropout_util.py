@@ -50,6 +50,19 @@ class FixableDropout(nn.Module):
     def __repr__(self) -> str:
         return f"FixableDropout({self.p:0.3})"
 
+def cache_dropout_layers(module):
+    '''
+        Collects all unpatched dropout layers of a module and caches them on the
+        top-level module as `_mc_dropout_layers`, so inference-time code can flip
+        them to train mode without re-scanning the whole module tree per call.
+    '''
+    module._mc_dropout_layers = [
+        m for m in module.modules()
+        if isinstance(m, (nn.Dropout, nn.Dropout1d, nn.Dropout2d, nn.Dropout3d, nn.AlphaDropout))
+    ]
+    return module._mc_dropout_layers
+
+
 def patch_dropout(module, freeze_on_eval=False, override_p=None, patch_fixable=False):
     '''
         Replaces all torch.nn.Dropout layers by FixableDropout layers.
@@ -19,16 +19,18 @@ class Infer:
         num_devices (int, optional): The desired number of gpu devices that will be utilized. Defaults to 1.
         cache_size (int, optional): The size of cache used to store particles. Defaults to 4.
         view_size (int, optional): The number of particles to consider storing in cache. Defaults to 4.
-    """ 
-    def __init__(self, mk_nn: Callable, *args: any, num_devices=1, cache_size=4, view_size=4) -> None:
+        f_cuda_graphs (bool, optional): Whether to capture particle training steps as CUDA graphs. Defaults to False.
+    """
+    def __init__(self, mk_nn: Callable, *args: any, num_devices=1, cache_size=4, view_size=4, f_cuda_graphs=False) -> None:
         self.mk_nn = mk_nn
         self.args = args
         self.num_devices = num_devices
         self.cache_size = cache_size
         self.view_size = view_size
-        
+        self.f_cuda_graphs = f_cuda_graphs
+
         # Create a PusH Distribution
-        self.push_dist = ppush.PusH(self.mk_nn, *self.args, cache_size=self.cache_size, view_size=self.view_size)
+        self.push_dist = ppush.PusH(self.mk_nn, *self.args, cache_size=self.cache_size, view_size=self.view_size, f_cuda_graphs=self.f_cuda_graphs)
         atexit.register(self._cleanup)
 
     def bayes_infer(self, dataloader: DataLoader, epochs: int, **kwargs) -> None:
@@ -1,20 +1,22 @@
+import warnings
+
 import torch
 import torch.nn as nn
 from torch.utils.data import DataLoader
 from tqdm import tqdm
 from typing import *
 
-from push.bayes.dropout_util import patch_dropout
+from push.bayes.dropout_util import cache_dropout_layers, patch_dropout
 from push.bayes.infer import Infer
 from push.particle import Particle
-from push.lib.utils import detach_to_cpu
+from push.lib.utils import detach_to_cpu, detach_to_device
 
 
 # =============================================================================
 # Helper
 # =============================================================================
 
-def mk_module(mk_nn: Callable[..., Any], patch, *args: any) -> nn.Module:
+def mk_module(mk_nn: Callable[..., Any], patch, f_compile, *args: any) -> nn.Module:
     """Wrapper for mk_nn that patches dropout if set.
 
     NOT meant to be used outside of MultiMCDropout.
@@ -22,15 +24,24 @@ def mk_module(mk_nn: Callable[..., Any], patch, *args: any) -> nn.Module:
     Args:
         mk_nn (Callable): Function that returns a nn.Module.
         patch (bool): Whether to patch dropout layers.
+        f_compile (bool): Whether to compile the module with torch.compile.
         *args (list): Arguments for mk_nn.
-    
+
     Returns:
         nn.Module: Patched nn.Module.
     """
     if patch:
-        return mk_nn(*args).apply(patch_dropout)
+        module = mk_nn(*args).apply(patch_dropout)
     else:
-        return mk_nn(*args)
+        module = mk_nn(*args)
+    cache_dropout_layers(module)
+    if f_compile and hasattr(torch, "compile"):
+        try:
+            # One-time compile amortized over every subsequent step/predict
+            module = torch.compile(module, mode="reduce-overhead")
+        except Exception as e:
+            warnings.warn(f"torch.compile failed ({e}), falling back to eager")
+    return module
 
 
 def mk_optim(params):
@@ -42,47 +53,210 @@ def mk_optim(params):
     Returns:
         torch.optim.Adam: Adam optimizer.
     """
-    return torch.optim.Adam(params, lr=1e-4, weight_decay=1e-2)
+    params = list(params)
+    if len(params) > 0 and params[0].is_cuda:
+        try:
+            # Fused Adam runs the update as one kernel instead of one per parameter.
+            return torch.optim.Adam(params, lr=1e-4, weight_decay=1e-2, fused=True)
+        except (RuntimeError, TypeError):
+            pass
+    return torch.optim.Adam(params, lr=1e-4, weight_decay=1e-2, foreach=True)
 
 
 # =============================================================================
 # MC Dropout Particle Functions
 # =============================================================================
 
+def _to_device_async(device: int, val):
+    """Moves a tensor to `device` with a pinned-memory, non-blocking copy.
+
+    Pinning lets the host to device transfer overlap with the previous step's
+    compute. Dataloaders created with `pin_memory=True` avoid the extra pin here.
+
+    Args:
+        device (int): The target device identifier.
+        val: Value pulled from the dataloader.
+
+    Returns:
+        The value on `device` if it is a tensor, unchanged otherwise.
+    """
+    if isinstance(val, torch.Tensor):
+        if not val.is_pinned():
+            val = val.pin_memory()
+        return val.to(device, non_blocking=True)
+    else:
+        return val
+
+
+# Base seed shared by all particles so every epoch's shuffle order matches
+_MULTIMC_SEED = 1234
+
+
 def _multimc_main(particle: Particle, dataloader: DataLoader, loss_fn: Callable, epochs: int) -> None:
+    # Workers consume the dataloader themselves; one message per worker for
+    # the entire run instead of one broadcast of (data, label) per batch
+    futs = particle.broadcast(particle.other_particles(), "MULTIMC_TRAIN", dataloader, loss_fn, epochs)
+    _multimc_train(particle, dataloader, loss_fn, epochs, f_verbose=True)
+    particle.wait(futs)
+
+
+def _multimc_train(particle: Particle, dataloader: DataLoader, loss_fn: Callable, epochs: int, f_verbose: bool = False) -> None:
+    """Per-particle training loop.
+
+    Every particle (leader and workers) iterates the dataloader locally with
+    the same per-epoch shuffle seed, so all particles see the same batch order
+    without the leader re-sending each batch. Only the sampler's generator is
+    seeded; dropout masks keep drawing from each particle's own RNG stream so
+    ensemble members stay diverse.
+
+    Args:
+        particle (Particle): Particle to train.
+        dataloader (DataLoader): Dataloader.
+        loss_fn (Callable): Loss function to be used during training.
+        epochs (int): Number of epochs to train for.
+        f_verbose (bool, optional): Whether to report progress and losses.
+
+    Returns:
+        None.
+    """
     print_loop = max(int(epochs/10),1)
-    tq = tqdm(range(epochs))
+    f_cuda = torch.cuda.is_available()
+    # Keep a few batches worth of steps in flight so compute and communication overlap
+    window = 4
+    try:
+        # Preallocate one slot per step so losses are stored as detached
+        # scalars instead of a growing list of graph-retaining tensors
+        losses = torch.empty(len(dataloader))
+    except TypeError:
+        losses = None
+    if not particle.module.training:
+        particle.module.train()
+    # Drive the shuffle through a dedicated generator on the sampler instead
+    # of reseeding the global RNG, which would also synchronize dropout masks
+    # across particles
+    shuffle_gen = None
+    sampler = getattr(dataloader, "sampler", None)
+    if sampler is not None and hasattr(sampler, "generator"):
+        shuffle_gen = torch.Generator()
+        sampler.generator = shuffle_gen
+    # Rate-limit the progress bar so its refresh doesn't fire on every epoch
+    tq = tqdm(range(epochs), mininterval=1.0, miniters=print_loop) if f_verbose else range(epochs)
     # Training loop
     for e in tq:
-        losses_futs = []
+        # Same shuffle order on every particle
+        if shuffle_gen is not None:
+            shuffle_gen.manual_seed(_MULTIMC_SEED + e)
+        inflight = []
+        n_losses = 0
+        if losses is None or isinstance(losses, list):
+            # Length of dataloader unknown; fall back to a list of floats
+            losses = []
+
+        def drain(fut):
+            nonlocal losses, n_losses
+            loss = fut.wait()
+            if isinstance(losses, list):
+                losses += [loss.detach().item()]
+            else:
+                losses[n_losses] = loss.detach().item()
+            n_losses += 1
+
         for data, label in dataloader:
-            losses_futs += [particle.step(loss_fn, data, label)]
-            for pid in particle.other_particles():
-                losses_futs += [particle.send(pid, "MULTIMC_STEP", loss_fn, data, label)]
-        if e % print_loop == 0:
-            losses = [l.wait() for l in losses_futs]
-            average_loss = sum(losses)/len(losses)
+            if f_cuda:
+                # Overlap host to device copy with the previous step's compute
+                data = _to_device_async(particle.device, data)
+                label = _to_device_async(particle.device, label)
+            inflight += [particle.step(loss_fn, data, label)]
+            while len(inflight) > window:
+                drain(inflight.pop(0))
+        # Drain remaining steps at the epoch boundary
+        for fut in inflight:
+            drain(fut)
+        if f_verbose and e % print_loop == 0:
+            if isinstance(losses, list):
+                average_loss = sum(losses) / len(losses)
+            else:
+                average_loss = losses[:n_losses].mean().item()
             tq.set_postfix({"loss: " : average_loss})
             # print(f"Average loss after epoch {e}: {average_loss}")
 
 
-def _multimc_step(particle: Particle, loss_fn: Callable, data, label, *args):
-    particle.module.train()
-    return particle.step(loss_fn, data, label, *args).wait()
-
-
 # =============================================================================
 # MC Dropout Inference
 # =============================================================================
 
 def freeze_dropout(particle: Particle):
+    layers = getattr(particle.module, "_mc_dropout_layers", None)
+    if layers is None:
+        layers = cache_dropout_layers(particle.module)
+
+    # Already frozen by a previous prediction call; skip the O(#modules) walk
+    if not particle.module.training and (len(layers) == 0 or layers[0].training):
+        return
+
     # Set FixableDropout to eval mode
     particle.module.eval()
 
-    # Set normal (unpatched) dropout layers to train mode
-    for module in particle.module.modules():
-        if module.__class__.__name__.startswith('Dropout'):
-            module.train()
+    # Set normal (unpatched) dropout layers to train mode, using the list
+    # cached at patch time instead of re-scanning the module tree per call
+    for module in layers:
+        module.train()
+
+
+def _detach_to_cpu_buffered(particle: Particle, val):
+    """Copies a prediction tensor to a reusable pinned CPU buffer.
+
+    Allocating a fresh CPU tensor per predict call makes the device to host
+    copy synchronous and churns the allocator. Each particle keeps one pinned
+    buffer in its state (re-allocated only on shape/dtype change) and copies
+    into it non-blocking. The buffer is reused by the particle's next call,
+    so callers that keep the result must copy it (stacking already does).
+
+    Args:
+        particle (Particle): Particle making the prediction.
+        val: Prediction value.
+
+    Returns:
+        The prediction on CPU.
+    """
+    if not isinstance(val, torch.Tensor) or not val.is_cuda:
+        return detach_to_cpu(val)
+    buf = particle.state.get("_pred_cpu_buf", None)
+    if buf is None or buf.shape != val.shape or buf.dtype != val.dtype:
+        buf = torch.empty(val.shape, dtype=val.dtype, pin_memory=True)
+        particle.state["_pred_cpu_buf"] = buf
+    buf.copy_(val.detach(), non_blocking=True)
+    torch.cuda.synchronize(val.device)
+    return buf
+
+
+def _mc_forward_samples(particle: Particle, data, num_samples: int, freeze_on_eval: bool) -> torch.Tensor:
+    """Draws `num_samples` stochastic forward passes from a particle.
+
+    When dropout masks are resampled per element (freeze_on_eval False), the
+    samples are folded into the batch dimension so one forward produces all
+    of them, amortizing kernel-launch overhead. With frozen masks the draws
+    must stay separate forwards since each forward uses a single mask.
+
+    Args:
+        particle (Particle): Particle to sample from.
+        data: Input batch.
+        num_samples (int): Number of Monte Carlo samples.
+        freeze_on_eval (bool): Whether to freeze dropout masks per forward.
+
+    Returns:
+        torch.Tensor: Stacked samples of shape (num_samples, batch, ...).
+    """
+    if freeze_on_eval or not isinstance(data, torch.Tensor):
+        freeze_dropout(particle)
+        preds = [particle.forward(data).wait() for _ in range(num_samples)]
+        return torch.stack(preds, dim=0)
+    else:
+        if not particle.module.training:
+            particle.module.train()
+        rep = data.repeat(num_samples, *([1] * (data.dim() - 1)))
+        out = particle.forward(rep).wait()
+        return out.view(num_samples, data.shape[0], *out.shape[1:])
 
 
 def _leader_pred_dl(particle: Particle, dataloader: DataLoader, f_reg=True, mode="mean", num_samples=10, freeze_on_eval=True) -> torch.Tensor:
@@ -93,41 +267,38 @@ def _leader_pred_dl(particle: Particle, dataloader: DataLoader, f_reg=True, mode
 
 
 def _leader_pred(particle: Particle, data, f_reg=True, mode="mean", num_samples=10, freeze_on_eval=True):
-    if freeze_on_eval:
-        freeze_dropout(particle)
-    else:
-        particle.module.train()
-    preds = []
-    my_preds = [detach_to_cpu(particle.forward(data).wait()) for _ in range(num_samples)]
-    preds += torch.stack(my_preds, dim=0)
+    # Keep every particle's samples on device and reduce there; only the
+    # reduced result crosses to host instead of particles x samples tensors
+    preds = [_mc_forward_samples(particle, data, num_samples, freeze_on_eval).detach()]
     for pid in particle.other_particles():
-        preds += particle.send(pid, "MULTIMC_PRED", data, num_samples).wait()
-    t_preds = torch.stack(preds, dim=1)
+        pred = particle.send(pid, "MULTIMC_PRED", data, num_samples, freeze_on_eval, False).wait()
+        preds += [detach_to_device(particle.device, pred)]
+    t_preds = torch.cat(preds, dim=0).movedim(0, 1)
     if f_reg:
         if mode == "mean":
-            return t_preds.mean(dim=1)
+            return detach_to_cpu(t_preds.mean(dim=1))
         elif mode == "median":
-            return t_preds.median(dim=1).values
+            return detach_to_cpu(t_preds.median(dim=1).values)
         elif mode == "min":
-            return t_preds.min(dim=1).values
+            return detach_to_cpu(t_preds.min(dim=1).values)
         elif mode == "max":
-            return t_preds.max(dim=1).values
+            return detach_to_cpu(t_preds.max(dim=1).values)
         elif mode == "raw":
-            return t_preds
+            return detach_to_cpu(t_preds)
         else:
             raise ValueError(f"Mode {mode} not supported ...")
     else:
         cls = t_preds.softmax(dim=1).argmax(dim=1)
-        return torch.mode(cls, dim=1)
+        return torch.mode(detach_to_cpu(cls), dim=1)
 
 
-def _multimc_pred(particle: Particle, data: torch.Tensor, num_samples: int = 10, freeze_on_eval: bool = True):
-    if freeze_on_eval:
-        freeze_dropout(particle)
+def _multimc_pred(particle: Particle, data: torch.Tensor, num_samples: int = 10, freeze_on_eval: bool = True, f_cpu: bool = True):
+    preds = _mc_forward_samples(particle, data, num_samples, freeze_on_eval)
+    if f_cpu:
+        return _detach_to_cpu_buffered(particle, preds)
     else:
-        particle.module.train()
-    preds = [detach_to_cpu(particle.forward(data).wait()) for _ in range(num_samples)]
-    return torch.stack(preds, dim=0)
+        # Leader reduces on device; hand back the on-device samples
+        return preds.detach()
 
 
 # =============================================================================
@@ -141,9 +312,11 @@ class MultiMCDropout(Infer):
         num_devices (int): Number of devices to use.
         cache_size (int): Size of cache.
         view_size (int): Size of view.
+        f_cuda_graphs (bool): Whether to capture particle training steps as CUDA graphs.
     """
-    def __init__(self, mk_nn: Callable[..., Any], *args: any, patch=True, num_devices=1, cache_size=4, view_size=4) -> None:
-        super(MultiMCDropout, self).__init__(mk_module, *(mk_nn, patch, *args), num_devices=num_devices, cache_size=cache_size, view_size=view_size)
+    def __init__(self, mk_nn: Callable[..., Any], *args: any, patch=True, f_compile=False, num_devices=1, cache_size=4, view_size=4, f_cuda_graphs=False) -> None:
+        super(MultiMCDropout, self).__init__(mk_module, *(mk_nn, patch, f_compile, *args), num_devices=num_devices, cache_size=cache_size, view_size=view_size, f_cuda_graphs=f_cuda_graphs)
+        self._f_pred_registered = False
 
     def bayes_infer(self,
                     dataloader: DataLoader, 
@@ -153,21 +326,28 @@ class MultiMCDropout(Infer):
                     mk_optim=mk_optim, mk_scheduler=None, f_save: bool = False):
         """Create PusH distribution and train it.
         """
+        # Round-robin the whole ensemble (leader included) over devices so
+        # device 0 does not carry the leader plus its share of workers.
+        devices = [i % self.num_devices for i in range(size_ensemble)]
+
         # Create main particle
         pids = []
-        pid_main = self.push_dist.p_create(mk_optim, mk_scheduler, device=0, receive={
+        pid_main = self.push_dist.p_create(mk_optim, mk_scheduler, device=devices[0], receive={
             "MULTIMC_MAIN": _multimc_main,
             "LEADER_PRED_DL": _leader_pred_dl,
             "LEADER_PRED": _leader_pred,
-        })
+        }, f_broadcast=False)
         pids.append(pid_main)
 
         # Create worker particles
         for i in range(size_ensemble-1):
-            pids.append(self.push_dist.p_create(mk_optim, mk_scheduler,device=(i % self.num_devices), receive={
-                "MULTIMC_STEP": _multimc_step,
-                "MULTIMC_PRED": _multimc_pred,
-            }))
+            # NOTE: MULTIMC_PRED is registered lazily on the first posterior_pred call
+            pids.append(self.push_dist.p_create(mk_optim, mk_scheduler,device=devices[i+1], receive={
+                "MULTIMC_TRAIN": _multimc_train,
+            }, f_broadcast=False))
+
+        # Broadcast once after the whole ensemble is created
+        self.push_dist.p_broadcast()
 
         # Train ensemble
         self.push_dist.p_wait([self.push_dist.p_launch(pid_main, "MULTIMC_MAIN", dataloader, loss_fn, epochs)])
@@ -177,6 +357,12 @@ class MultiMCDropout(Infer):
             self.push_dist.save()
 
     def posterior_pred(self, data: DataLoader | torch.Tensor, f_reg=True, mode="mean", num_samples=10, freeze_on_eval=False) -> torch.Tensor:
+        if not self._f_pred_registered:
+            # Workers only need the prediction handler once inference starts
+            for pid in self.push_dist.particle_ids():
+                if pid != 0:
+                    self.push_dist.p_register(pid, "MULTIMC_PRED", _multimc_pred)
+            self._f_pred_registered = True
         if isinstance(data, torch.Tensor):
             fut = self.push_dist.p_launch(0, "LEADER_PRED", data, f_reg, mode, num_samples, freeze_on_eval)
             return self.push_dist.p_wait([fut])[fut._fid]
@@ -190,7 +376,7 @@ class MultiMCDropout(Infer):
     def train_mc_dropout(dataloader: Callable, loss_fn: Callable, epochs: int,
                         nn: Callable, *args, num_devices: int = 1, cache_size: int = 4, view_size: int = 4,
                         size_ensemble: int = 2, mk_optim = mk_optim,
-                        mc_entry = _multimc_main, patch=False) -> List[torch.Tensor]:
+                        mc_entry = _multimc_main, patch=False, f_compile=False, f_cuda_graphs=False) -> List[torch.Tensor]:
         """Creates and trains a MC Dropout ensemble.
         
         Args:
@@ -206,8 +392,10 @@ class MultiMCDropout(Infer):
             mk_optim (Callable): Returns an optimizer.
             mc_entry (function, optional): Training loop for MC Dropout.
             patch (bool, optional): Whether to patch dropout layers.
+            f_compile (bool, optional): Whether to compile particle modules with torch.compile.
+            f_cuda_graphs (bool, optional): Whether to capture particle training steps as CUDA graphs.
         """
-        mc_dropout = MultiMCDropout(nn, *args, patch=patch, num_devices=num_devices, cache_size=cache_size, view_size=view_size)
+        mc_dropout = MultiMCDropout(nn, *args, patch=patch, f_compile=f_compile, num_devices=num_devices, cache_size=cache_size, view_size=view_size, f_cuda_graphs=f_cuda_graphs)
         mc_dropout.bayes_infer(dataloader, epochs, loss_fn, size_ensemble, mk_optim)
         return mc_dropout
 
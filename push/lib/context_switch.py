@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from typing import *
 import threading
 
@@ -5,6 +6,34 @@ import torch
 import torch.nn as nn
 
 
+# cudaMemAdvise advice constant (cudaMemAdviseSetPreferredLocation)
+_CUDA_MEM_ADVISE_PREFERRED_LOCATION = 3
+
+
+def _advise_preferred_location(module: nn.Module, device: int) -> None:
+    """Best-effort hint that a module's parameters should stay on `device`.
+
+    Issues cudaMemAdvise(SetPreferredLocation) over each parameter so
+    unified-memory allocations are not migrated off the device under cache
+    pressure. The advice only applies to managed memory; on the default
+    caching allocator the runtime rejects it, so all failures are swallowed
+    and the hint degrades to a no-op.
+
+    Args:
+        module (nn.Module): The module whose parameters to advise on.
+        device (int): The device id.
+    """
+    if not torch.cuda.is_available():
+        return
+    try:
+        cudart = torch.cuda.cudart()
+        for p in module.parameters():
+            cudart.cudaMemAdvise(p.data_ptr(), p.numel() * p.element_size(),
+                                 _CUDA_MEM_ADVISE_PREFERRED_LOCATION, device)
+    except Exception:
+        pass
+
+
 class ParticleCache:
     """Loads particles on and off the accelerator.
 
@@ -89,11 +118,10 @@ class ParticleCache:
             None
 
         """
-        params = []
-        params_grad = []
-        for param in module.parameters():
-            params_grad += [param.grad.detach().to("cpu") if param.grad is not None else None]
-            params += [param.detach().to("cpu")]
+        # Single pass, sized-once lists; per-parameter `+= [x]` churns the GC
+        params = [param.detach().to("cpu") for param in module.parameters()]
+        params_grad = [param.grad.detach().to("cpu") if param.grad is not None else None
+                       for param in module.parameters()]
         self._module_disk[pid] = (params, params_grad)
 
     def _load_w_grads(self, pid: int, module: nn.Module) -> None:
@@ -138,6 +166,7 @@ class ParticleCache:
             # module.apply(module.prior.init_weights)
             module.apply(module.trainable.init_weights)
         module = module.to(self._device)
+        _advise_preferred_location(module, self._device)
         # Save new module to disk
         self._module_disk[pid] = (module.parameters(), [param.grad for param in module.parameters()])
 
@@ -196,6 +225,7 @@ class ParticleCache:
         with self._lock:
             if self._active2pid[c_idx][0] == pid:
                 self._pinned.add(pid)
+                _advise_preferred_location(self._active2pid[c_idx][1], self._device)
                 return True
             else:
                 return False
@@ -284,12 +314,6 @@ class ParticleCache:
             # print(self._optim_cache)
             # self._optim_cache[pid] = self._mk_optims[pid](new_module.parameters())
 
-            params_grad = []
-            params = []
-            for param in new_module.parameters():
-                params_grad += [param.grad.detach().to("cpu") if param.grad is not None else None]
-                params += [param.detach().to("cpu")]
-            
             # Result
             return new_module
 
@@ -327,6 +351,197 @@ class ParticleCache:
         return f"active2pid: {str({k: v[0] for k, v in self._active2pid.items()})}\n cache2pid: {str(self._cache2pid)}"
     
 
+class ARCParticleCache:
+    """Loads particle views on and off the accelerator with ARC replacement.
+
+    A flood of one-off `get` calls can evict every frequently reused view
+    under plain FIFO/LRU (scan pollution). ARC (Megiddo-Modha) splits the
+    resident set into a recency queue T1 and a frequency queue T2, keeps
+    ghost lists B1/B2 of recently evicted pids, and self-tunes the target
+    size `p` of T1 from ghost hits, so streaming access patterns cannot
+    push out views that are reused.
+
+    Attributes:
+        mk_module (Callable): The function to create a new module.
+        args (List[any]): The arguments to pass to the `mk_module` function.
+        cache_size (int): The maximum cache size.
+        device (int): The device id.
+        lock (threading.Lock): The lock guarding cache state.
+    """
+    def __init__(self, mk_module: Callable, args: List[any], cache_size: int, device: int, lock: threading.Lock) -> None:
+        # Module
+        self.mk_module = mk_module
+        self.args = args
+
+        # Device
+        self._device = device
+
+        # Cache
+        self._cache_size = max(1, int(cache_size))
+        self._resident = {}             # pid -> module (device)
+        self._saved = {}                # pid -> (params, grads) (cpu)
+        self._optim_cache = {}          # pid -> Optimizer
+        self._mk_optims = {}            # pid -> closure
+        self._lock = lock
+
+        # ARC state: T1/T2 hold resident pids, B1/B2 hold ghost pids
+        self._t1 = OrderedDict()
+        self._t2 = OrderedDict()
+        self._b1 = OrderedDict()
+        self._b2 = OrderedDict()
+        self._p = 0                     # adaptive target size of T1
+
+    def _save(self, pid: int, module: nn.Module) -> None:
+        params = [param.detach().to("cpu") for param in module.parameters()]
+        params_grad = [param.grad.detach().to("cpu") if param.grad is not None else None
+                       for param in module.parameters()]
+        self._saved[pid] = (params, params_grad)
+
+    def _load(self, pid: int) -> nn.Module:
+        module = self.mk_module(*self.args)
+        params, params_grad = self._saved.pop(pid)
+        for p, param, param_grad in zip(module.parameters(), params, params_grad):
+            p.data = param
+            p.grad = param_grad
+        return module.to(self._device)
+
+    def _replace(self, pid: int) -> None:
+        """Evict one resident view to make room, choosing T1 vs T2 by `p`."""
+        if len(self._t1) > 0 and (len(self._t1) > self._p or (pid in self._b2 and len(self._t1) == self._p)):
+            victim, _ = self._t1.popitem(last=False)
+            self._b1[victim] = None
+        else:
+            victim, _ = self._t2.popitem(last=False)
+            self._b2[victim] = None
+        self._save(victim, self._resident.pop(victim))
+
+    def _admit(self, pid: int) -> None:
+        """Run the ARC bookkeeping for a miss on `pid` (before loading it)."""
+        c = self._cache_size
+        if pid in self._b1:
+            # Recency ghost hit: grow T1's target
+            self._p = min(self._p + max(1, len(self._b2) // max(1, len(self._b1))), c)
+            del self._b1[pid]
+            if len(self._t1) + len(self._t2) >= c:
+                self._replace(pid)
+            self._t2[pid] = None
+        elif pid in self._b2:
+            # Frequency ghost hit: shrink T1's target
+            self._p = max(self._p - max(1, len(self._b1) // max(1, len(self._b2))), 0)
+            del self._b2[pid]
+            if len(self._t1) + len(self._t2) >= c:
+                self._replace(pid)
+            self._t2[pid] = None
+        else:
+            # Cold miss
+            if len(self._t1) + len(self._b1) == c:
+                if len(self._t1) < c:
+                    self._b1.popitem(last=False)
+                    if len(self._t1) + len(self._t2) >= c:
+                        self._replace(pid)
+                else:
+                    # T1 fills the cache: retire its LRU without a ghost entry
+                    victim, _ = self._t1.popitem(last=False)
+                    self._save(victim, self._resident.pop(victim))
+            else:
+                total = len(self._t1) + len(self._t2) + len(self._b1) + len(self._b2)
+                if total >= c:
+                    if total >= 2 * c:
+                        self._b2.popitem(last=False)
+                    if len(self._t1) + len(self._t2) >= c:
+                        self._replace(pid)
+            self._t1[pid] = None
+
+    def create(self, pid: int, mk_optim: Callable, mk_scheduler: Callable = None, prior = False, train_key = None) -> nn.Module:
+        """
+        Create a new module and manage the cache.
+
+        Args:
+            pid (int): The particle id.
+            mk_optim (Callable): The function to create a new optimizer.
+
+        Returns:
+            nn.Module: The created module.
+
+        """
+        with self._lock:
+            module = self.mk_module(*self.args)
+            module = module.to(self._device)
+            self._admit(pid)
+            self._resident[pid] = module
+            self._mk_optims[pid] = mk_optim
+            self._optim_cache[pid] = mk_optim(module.parameters())
+            return module
+
+    def try_read(self, pid: int, pin=False, msg=None) -> nn.Module:
+        """
+        Attempt to read a particle view, reloading it on a cache miss.
+
+        Args:
+            pid (int): The particle id.
+            pin (bool, optional): Unused; kept for cache-interface parity.
+            msg: Additional message. Defaults to None.
+
+        Returns:
+            nn.Module: The module associated with the particle.
+
+        """
+        with self._lock:
+            if pid in self._resident:
+                # Hit: promote to the frequency queue
+                if pid in self._t1:
+                    del self._t1[pid]
+                    self._t2[pid] = None
+                else:
+                    self._t2.move_to_end(pid)
+                return self._resident[pid]
+            if pid not in self._saved:
+                return None
+            self._admit(pid)
+            module = self._load(pid)
+            self._resident[pid] = module
+            return module
+
+    def read(self, pid: int) -> nn.Module:
+        """
+        Read a particle view from cache.
+
+        Args:
+            pid (int): The particle id.
+
+        Returns:
+            nn.Module: The module associated with the particle.
+
+        """
+        return self.try_read(pid)
+
+    def contains(self, pid):
+        """
+        Check if the cache contains a particle.
+
+        Args:
+            pid: The particle id.
+
+        Returns:
+            bool: True if the cache contains the particle, False otherwise.
+
+        """
+        return pid in self._resident or pid in self._saved
+
+    def particles(self) -> List[int]:
+        """
+        Returns a list of particle ids in the cache.
+
+        Returns:
+            List[int]: A list of particle ids.
+
+        """
+        return list(self._resident.keys()) + list(self._saved.keys())
+
+    def __str__(self) -> str:
+        return f"t1: {list(self._t1)} t2: {list(self._t2)} b1: {list(self._b1)} b2: {list(self._b2)} p: {self._p}"
+
+
 class ParticleCacheLRU:
     """Loads particles on and off the accelerator.
 
@@ -0,0 +1,178 @@
+from collections import OrderedDict
+from typing import *
+
+
+class DevicePolicy:
+    """Tracks the active (pid, thread) per device and chooses eviction victims.
+
+    The Node Event Loop keeps at most one in-flight particle thread per
+    device. When every device is busy and a context switch needs a device
+    back, the policy decides which active thread to retire first.
+
+    Attributes:
+        _entries (Dict[int, Tuple[int, any]]): Mapping of device to (pid, thread).
+    """
+    def __init__(self) -> None:
+        self._entries = {}              # Type: device -> (pid, thread)
+
+    def __contains__(self, device: int) -> bool:
+        return device in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def active_pid(self, device: int) -> Optional[int]:
+        """Return the pid active on a device, or None if the device is idle.
+
+        Args:
+            device (int): Device identifier.
+
+        Returns:
+            Optional[int]: Particle identifier, or None.
+        """
+        entry = self._entries.get(device)
+        return entry[0] if entry is not None else None
+
+    def insert(self, device: int, pid: int, thread: any) -> None:
+        """Record the active (pid, thread) for a device.
+
+        Args:
+            device (int): Device identifier.
+            pid (int): Particle identifier.
+            thread: Thread running the particle's operation.
+        """
+        raise NotImplementedError
+
+    def touch(self, device: int) -> None:
+        """Note a reuse of the device's active entry.
+
+        Args:
+            device (int): Device identifier.
+        """
+        raise NotImplementedError
+
+    def pop(self, device: int) -> Tuple[int, any]:
+        """Remove and return the (pid, thread) active on a device.
+
+        Args:
+            device (int): Device identifier.
+
+        Returns:
+            Tuple[int, any]: The (pid, thread) pair.
+        """
+        raise NotImplementedError
+
+    def evict(self) -> Tuple[int, int, any]:
+        """Choose a victim and remove it.
+
+        Returns:
+            Tuple[int, int, any]: The (device, pid, thread) triple.
+        """
+        raise NotImplementedError
+
+
+class LRUPolicy(DevicePolicy):
+    """Evicts the least recently inserted/touched device entry.
+
+    This is the previous OrderedDict FIFO behavior with recency updates.
+    """
+    def __init__(self) -> None:
+        super(LRUPolicy, self).__init__()
+        self._entries = OrderedDict()
+
+    def insert(self, device: int, pid: int, thread: any) -> None:
+        self._entries[device] = (pid, thread)
+        self._entries.move_to_end(device)
+
+    def touch(self, device: int) -> None:
+        if device in self._entries:
+            self._entries.move_to_end(device)
+
+    def pop(self, device: int) -> Tuple[int, any]:
+        return self._entries.pop(device)
+
+    def evict(self) -> Tuple[int, int, any]:
+        device, (pid, thread) = self._entries.popitem(last=False)
+        return device, pid, thread
+
+
+# Bound on TwoQueuePolicy's reuse-memory LRU; well above any realistic
+# device count
+_HOT_PIDS_MAX = 32
+
+
+class TwoQueuePolicy(DevicePolicy):
+    """2Q eviction: new entries queue in A1, entries of reused pids in Am.
+
+    A device running a particle that is actually reused back-to-back (e.g.
+    the one being trained across many `step` calls) sits in the Am LRU queue
+    and is only evicted once the A1 FIFO of one-off entries (`get`/view
+    bursts) is drained, so streaming access patterns cannot push out the hot
+    particle. Reuse is reported via `touch`; pids enter the bounded `_hot`
+    LRU there, never on plain inserts, so one-off particles stay in A1 no
+    matter how often they reappear.
+    """
+    def __init__(self) -> None:
+        super(TwoQueuePolicy, self).__init__()
+        self._a1 = OrderedDict()        # Type: device -> None, FIFO of probationary entries
+        self._am = OrderedDict()        # Type: device -> None, LRU of reused entries
+        self._hot = OrderedDict()       # Type: pid -> None, LRU of recently reused pids
+
+    def insert(self, device: int, pid: int, thread: any) -> None:
+        self._entries[device] = (pid, thread)
+        self._a1.pop(device, None)
+        self._am.pop(device, None)
+        if pid in self._hot:
+            self._hot.move_to_end(pid)
+            self._am[device] = None
+        else:
+            self._a1[device] = None
+
+    def touch(self, device: int) -> None:
+        entry = self._entries.get(device)
+        if entry is None:
+            return
+        # Reuse of the active entry is the promotion signal; the reuse
+        # memory is a small LRU so cold particles eventually age out
+        self._hot[entry[0]] = None
+        self._hot.move_to_end(entry[0])
+        while len(self._hot) > _HOT_PIDS_MAX:
+            self._hot.popitem(last=False)
+        if device in self._a1:
+            self._a1.pop(device)
+            self._am[device] = None
+        elif device in self._am:
+            self._am.move_to_end(device)
+
+    def pop(self, device: int) -> Tuple[int, any]:
+        self._a1.pop(device, None)
+        self._am.pop(device, None)
+        return self._entries.pop(device)
+
+    def evict(self) -> Tuple[int, int, any]:
+        if len(self._a1) > 0:
+            device, _ = self._a1.popitem(last=False)
+            pid, thread = self._entries.pop(device)
+        else:
+            device, _ = self._am.popitem(last=False)
+            pid, thread = self._entries.pop(device)
+            # A hot pid that still lost its device is no longer hot
+            self._hot.pop(pid, None)
+        return device, pid, thread
+
+
+def mk_device_policy(name: str) -> DevicePolicy:
+    """Construct a device eviction policy by name.
+
+    Args:
+        name (str): "2q" for `TwoQueuePolicy`, "lru" for `LRUPolicy`.
+
+    Returns:
+        DevicePolicy: The policy instance.
+    """
+    if name == "2q":
+        return TwoQueuePolicy()
+    elif name == "lru":
+        return LRUPolicy()
+    else:
+        raise ValueError(f"Unknown device policy {name} ... expected '2q' or 'lru'")
@@ -1,12 +1,23 @@
 import torch
 from typing import *
 
+from push.lib.utils import unflatten_params
+
 
 class MSG:
     """
     Base class for messages in the system.
+
+    Messages declare `__slots__` so the hot ones (constructed per
+    inter-particle call) are fixed-layout objects without a per-instance
+    `__dict__`, which makes them cheaper to build and smaller to pickle.
+
+    Each concrete message carries a small integer `TAG` that the Node Event
+    Loop uses to index its dispatch table, replacing a chain of `isinstance`
+    checks per message.
     """
-    pass
+    __slots__ = ()
+    TAG = -1
 
 
 # =============================================================================
@@ -17,6 +28,9 @@ class NodeEvtLoopInitMSG(MSG):
     """
     Message indicating the initialization of the Node Event Loop.
     """
+    __slots__ = ()
+    TAG = 0
+
     def __init__(self):
         pass
 
@@ -25,32 +39,63 @@ class NodeEvtLoopCleanupMSG(MSG):
     """
     Message indicating the cleanup of the Node Event Loop.
     """
+    __slots__ = ()
+    TAG = 1
+
     def __init__(self):
         pass
 
 
-class NELBroadcastParticlesMSG(MSG):
+class ParticleTable:
     """
-    Message for broadcasting particles in the Node Event Loop.
+    Structure-of-arrays routing table for particles.
+
+    Particle ids are assigned contiguously from 0, so the pid to device map is
+    stored as a dense list indexed by pid. The dispatch hot path does one list
+    index instead of a dict hash per message.
 
     Attributes:
-        in_queues (List[Queue]): List of input queues.
-        out_queues (List[Queue]): List of output queues.
+        in_queues (Dict[int, Any]): Input queue per rank.
+        out_queues (Dict[int, Any]): Output queue per rank.
         particle_to_device (Dict[int, int]): Mapping of particle ids to devices.
+        device_of_pid (List[int]): Dense pid to device map.
     """
-    def __init__(self, in_queues: List[Any], out_queues: List[Any], particle_to_device: Dict[int, int]):
+    __slots__ = ("in_queues", "out_queues", "particle_to_device", "device_of_pid")
+
+    def __init__(self, in_queues: Dict[int, Any], out_queues: Dict[int, Any], particle_to_device: Dict[int, int]):
         self.in_queues = in_queues
         self.out_queues = out_queues
         self.particle_to_device = particle_to_device
+        n = max(particle_to_device) + 1 if len(particle_to_device) > 0 else 0
+        self.device_of_pid = [-1] * n
+        for pid, device in particle_to_device.items():
+            self.device_of_pid[pid] = device
+
+
+class NELBroadcastParticlesMSG(MSG):
+    """
+    Message for broadcasting particles in the Node Event Loop.
+
+    Attributes:
+        table (ParticleTable): Routing table with queues and pid to device map.
+    """
+    __slots__ = ("table",)
+    TAG = 2
+
+    def __init__(self, in_queues: List[Any], out_queues: List[Any], particle_to_device: Dict[int, int]):
+        self.table = ParticleTable(in_queues, out_queues, particle_to_device)
 
     def __str__(self) -> str:
-        return f"NELBroadcastParticlesMSG({self.in_queues}, {self.out_queues}, {self.particle_to_device})"
+        return f"NELBroadcastParticlesMSG({self.table.in_queues}, {self.table.out_queues}, {self.table.particle_to_device})"
 
 
 class NELBroadcastParticlesAckMSG(MSG):
     """
     Acknowledgment message for broadcasting particles in the Node Event Loop.
     """
+    __slots__ = ()
+    TAG = 3
+
     def __init__(self):
         pass
 
@@ -62,6 +107,9 @@ class NELSaveModel(MSG):
     Attributes:
         pid_fid (Tuple[int, int]): Tuple of particle id and file id.
     """
+    __slots__ = ("pid_fid",)
+    TAG = 4
+
     def __init__(self, pid_fid: Tuple[int, int]):
         self.pid_fid = pid_fid
 
@@ -76,6 +124,9 @@ class NELSaveModelAckPDMSG(MSG):
     Attributes:
         pid_fid (Tuple[int, int]): Tuple of particle id and file id.
     """
+    __slots__ = ("pid_fid",)
+    TAG = 5
+
     def __init__(self, pid_fid: Tuple[int, int]):
         self.pid_fid = pid_fid
 
@@ -102,6 +153,9 @@ class ReceiveParticleInitPDMSG(MSG):
         receive (Callable): The function to receive particles.
         state (Any): State information for initialization.
     """
+    __slots__ = ("device", "pid", "mk_optim", "mk_scheduler", "receive", "state", "prior", "train_key")
+    TAG = 6
+
     def __init__(self, device: int, pid: int, mk_optim: Callable, mk_scheduler: Callable, prior: bool, train_key: int, receive: Callable, state: Any):
         self.device = device
         self.pid = pid
@@ -120,6 +174,9 @@ class ReceiveParticleInitAckPDMSG(MSG):
     """
     Acknowledgment message for particle initialization in Push Distribution.
     """
+    __slots__ = ()
+    TAG = 7
+
     def __init__(self):
         pass
 
@@ -134,6 +191,9 @@ class ReceiveRegisterPDMSG(MSG):
         fn (Callable): The function associated with the registration.
         state (Dict[str, Any]): State information for registration.
     """
+    __slots__ = ("pid", "msg", "fn", "state")
+    TAG = 8
+
     def __init__(self, pid: int, msg: str, fn: Callable, state: Dict[str, Any]):
         self.pid = pid
         self.msg = msg
@@ -148,6 +208,9 @@ class ReceiveRegisterAckPDMSG(MSG):
     """
     Acknowledgment message for registering particle reception in Push Distribution.
     """
+    __slots__ = ()
+    TAG = 9
+
     def __init__(self):
         pass
 
@@ -166,6 +229,9 @@ class ReceiveFuncPDMSG(MSG):
         msg (str): The message identifier.
         args (List[Any]): List of arguments for the function call.
     """
+    __slots__ = ("pid_fid", "pid_to", "msg", "args")
+    TAG = 10
+
     def __init__(self, pid_fid: Tuple[int, int], pid_to: int, msg: str, args: List[Any]):
         self.pid_fid = pid_fid
         self.pid_to = pid_to
@@ -184,6 +250,9 @@ class ReceiveFuncAckPDMSG(MSG):
         pid_fid (Tuple[int, int]): Tuple of particle id and function id.
         result (Any): The result of the function call.
     """
+    __slots__ = ("pid_fid", "result")
+    TAG = 11
+
     def __init__(self, pid_fid: Tuple[int, int], result: Any):
         self.pid_fid = pid_fid
         self.result = result
@@ -200,6 +269,9 @@ class ReceiveParametersPDMSG(MSG):
         pid_fid (Tuple[int, int]): Tuple of particle id and function id.
         pid (int): The particle id.
     """
+    __slots__ = ("pid_fid", "pid")
+    TAG = 12
+
     def __init__(self, pid_fid: Tuple[int, int], pid: int):
         self.pid_fid = pid_fid
         self.pid = pid
@@ -212,16 +284,31 @@ class ReceiveParametersAckPDMSG(MSG):
     """
     Acknowledgment message for receiving parameters in Push Distribution.
 
+    Parameters travel as one flat contiguous buffer plus shapes so the queue
+    carries a single tensor instead of one per layer; `params` unflattens
+    lazily on the receiving side.
+
     Attributes:
         pid_fid (Tuple[int, int]): Tuple of particle id and function id.
-        params (List[torch.Tensor]): List of parameters.
+        flat (torch.Tensor): Flattened parameters.
+        shapes (List[Any]): Per-parameter shapes, or None if `flat` is a plain list.
     """
-    def __init__(self, pid_fid: Tuple[int, int], params: List[torch.Tensor]):
+    __slots__ = ("pid_fid", "flat", "shapes")
+    TAG = 13
+
+    def __init__(self, pid_fid: Tuple[int, int], flat: torch.Tensor, shapes: List[Any]):
         self.pid_fid = pid_fid
-        self.params = params
+        self.flat = flat
+        self.shapes = shapes
+
+    @property
+    def params(self) -> List[torch.Tensor]:
+        if self.shapes is None:
+            return self.flat
+        return unflatten_params(self.flat, self.shapes)
 
     def __str__(self) -> str:
-        return f"ReceiveParametersAckPDMSG({self.pid_fid}, {self.params})"
+        return f"ReceiveParametersAckPDMSG({self.pid_fid}, {self.flat}, {self.shapes})"
 
 
 # =============================================================================
@@ -238,6 +325,9 @@ class ReceiveFuncMSG(MSG):
         msg_name (str): The name of the message.
         args (List[Any]): List of arguments for the function call.
     """
+    __slots__ = ("pid_fid", "pid", "msg_name", "args")
+    TAG = 14
+
     def __init__(self, pid_fid: Tuple[int, int], pid: int, msg_name: str, args: List[Any]):
         self.pid_fid = pid_fid
         self.pid = pid
@@ -248,10 +338,39 @@ class ReceiveFuncMSG(MSG):
         return f"ReceiveFuncMSG({self.pid_fid}, {self.pid}, {self.msg_name}, {self.args})"
 
 
+class ReceiveFuncBroadcastMSG(MSG):
+    """
+    Message for broadcasting a function call to many particles in Particle Communication.
+
+    Carries the arguments once; the receiving Node Event Loop fans the call out
+    to every `(pid, fid)` pair so the payload is deserialized a single time per rank.
+
+    Attributes:
+        pid_sender (int): The particle id of the sender.
+        pid_fids (List[Tuple[int, int]]): List of (receiver particle id, future id) pairs.
+        msg_name (str): The name of the message.
+        args (List[Any]): List of arguments for the function call.
+    """
+    __slots__ = ("pid_sender", "pid_fids", "msg_name", "args")
+    TAG = 15
+
+    def __init__(self, pid_sender: int, pid_fids: List[Tuple[int, int]], msg_name: str, args: List[Any]):
+        self.pid_sender = pid_sender
+        self.pid_fids = pid_fids
+        self.msg_name = msg_name
+        self.args = args
+
+    def __str__(self) -> str:
+        return f"ReceiveFuncBroadcastMSG({self.pid_sender}, {self.pid_fids}, {self.msg_name}, {self.args})"
+
+
 class ReceiveFuncAckMSG(MSG):
     """
     Acknowledgment message for receiving function calls in Particle Communication.
     """
+    __slots__ = ()
+    TAG = 16
+
     def __init__(self):
         pass
 
@@ -265,6 +384,9 @@ class ReceiveGetMSG(MSG):
         pid_caller (int): The particle id of the caller.
         pid (int): The particle id.
     """
+    __slots__ = ("pid_fid", "pid_caller", "pid")
+    TAG = 17
+
     def __init__(self, pid_fid: Tuple[int, int], pid_caller: int, pid: int):
         self.pid_fid = pid_fid
         self.pid_caller = pid_caller
@@ -278,12 +400,20 @@ class ReceiveGetAckMSG(MSG):
     """
     Acknowledgment message for receiving particle data in Particle Communication.
 
+    The parameters are shared-memory staging tensors owned by the sender and
+    only need to cross the queue once per receiver. `params` of None means
+    "reuse the staging tensors from the previous ack for this particle";
+    the sender has already refreshed their contents in place.
+
     Attributes:
         fid (int): The function id.
         pid (int): The particle id.
-        params (List[torch.Tensor]): List of parameters.
-        params_grad (List[torch.Tensor]): List of parameter gradients.
+        params (List[torch.Tensor]): List of parameters, or None if cached.
+        params_grad (List[torch.Tensor]): List of parameter gradients, or None if cached.
     """
+    __slots__ = ("fid", "pid", "params", "params_grad")
+    TAG = 18
+
     def __init__(self, fid: int, pid: int, params: List[torch.Tensor], params_grad: List[torch.Tensor]):
         self.fid = fid
         self.pid = pid
@@ -292,3 +422,8 @@ class ReceiveGetAckMSG(MSG):
 
     def __str__(self) -> str:
         return f"ReceiveGetAckMSG({self.fid}, {self.pid}, {self.params}, {self.params_grad})"
+
+
+# Number of distinct message tags; sized one past the largest `TAG` so the
+# Node Event Loop can preallocate its dispatch table.
+NUM_MSG_TAGS = 19
@@ -1,18 +1,227 @@
-from collections import OrderedDict
+import os
 import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
 import torch
 import torch.nn as nn
 import torch.multiprocessing as mp
 from typing import *
 
-from push.lib.context_switch import ParticleCacheLRU, ParticleCache
+from push.lib.context_switch import ParticleCacheLRU, ParticleCache, ARCParticleCache
+from push.lib.device_policy import mk_device_policy
 from push.lib.messages import *
-from push.lib.utils import detach_to_device, detach_to_cpu
+from push.lib.utils import bulk_copy_, detach_to_device, detach_to_cpu, flatten_params, to_shared_cpu
 from push.lib.waitable import Waitable
 from push.particle import Particle, ParticleView
 from push.pfuture import PFuture
 
 
+# Eager training steps per (pid, shapes) before capturing a CUDA graph
+_GRAPH_WARMUP = 3
+
+
+_cpu_affinity_masks = {}  # Type: device -> set[int] or None, resolved via NVML once
+
+
+def _set_device_cpu_affinity(device: int) -> None:
+    """Pins the calling thread to the CPUs local to `device`'s PCIe root.
+
+    On multi-socket machines a worker scheduled on the far socket pays
+    cross-socket traffic for every DMA setup and heap access. Best effort:
+    the mask comes from NVML once per device; any failure (no pynvml, no
+    NVML, platform without sched_setaffinity) leaves the thread unpinned.
+
+    Args:
+        device (int): Device whose local CPUs to pin to.
+    """
+    if device not in _cpu_affinity_masks:
+        mask = None
+        try:
+            import pynvml
+            pynvml.nvmlInit()
+            handle = pynvml.nvmlDeviceGetHandleByIndex(device)
+            words = pynvml.nvmlDeviceGetCpuAffinity(handle, (os.cpu_count() + 63) // 64)
+            cpus = {64 * i + b for i, w in enumerate(words) for b in range(64) if (w >> b) & 1}
+            if len(cpus) > 0:
+                mask = cpus
+        except Exception:
+            mask = None
+        _cpu_affinity_masks[device] = mask
+    mask = _cpu_affinity_masks[device]
+    if mask is not None:
+        try:
+            os.sched_setaffinity(0, mask)
+        except (AttributeError, OSError):
+            pass
+
+
+class _Task:
+    """A unit of work scheduled on a device worker.
+
+    Exposes the `join` interface of `threading.Thread` so `ParticleCache.release`
+    and `PFuture.wait` can block on completion without caring whether the work
+    ran on a fresh thread or a pooled one.
+    """
+    __slots__ = ("fn", "_ev", "_done")
+
+    def __init__(self, fn: Callable, ev=None) -> None:
+        self.fn = fn
+        self._ev = ev   # submit-time event the task stream must wait on
+        self._done = threading.Event()
+
+    def run(self, stream=None) -> None:
+        """Run the task, optionally on a CUDA stream.
+
+        With a stream, it first waits on the submit-time event so the task
+        is ordered after the submitter's pending work (non-blocking H2D
+        copies of the arguments); then the GPU work is enqueued there and
+        completion is gated on a recorded event, so `join` implies the
+        device work is finished, not just the Python closure.
+        """
+        try:
+            if stream is None:
+                self.fn()
+            else:
+                if self._ev is not None:
+                    stream.wait_event(self._ev)
+                with torch.cuda.stream(stream):
+                    self.fn()
+                ev = torch.cuda.Event()
+                ev.record(stream)
+                ev.synchronize()
+        finally:
+            self._done.set()
+
+    def join(self) -> None:
+        self._done.wait()
+
+
+class _DeviceWorker:
+    """Long-lived worker thread owning one device's compute tasks.
+
+    Spawning a thread per `forward`/`step`/`zero_grad` costs more than many of
+    the ops themselves; a single persistent thread per device drains a task
+    queue instead, and stays the sole submitter of work for its device.
+
+    An idle worker steals the oldest task of the nearest backlogged peer
+    (`peers` is sorted by device-index distance). Stealing is safe because
+    every submit for a device is preceded by a context switch that joins the
+    previous task on that device, so tasks of the same particle are never in
+    flight twice; torch ops execute on the tensors' own device regardless of
+    which thread runs the closure. A stolen task runs on the victim worker's
+    stream, so its kernels and completion event land on the device the
+    particle actually resides on.
+
+    Args:
+        device (int): Device this worker executes on.
+    """
+    def __init__(self, device: int) -> None:
+        self.device = device
+        self.peers = []                 # Type: [_DeviceWorker], set once all workers exist
+        # Dedicated stream: particles on this device queue behind each other
+        # without serializing against later default-stream traffic. Each task
+        # still waits on its submit-time event, so it starts only after the
+        # argument copies issued before submit. Created here so thieves can
+        # see it before this worker's thread has started.
+        self.stream = torch.cuda.Stream(device=device) if torch.cuda.is_available() else None
+        self._local = deque()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def _loop(self) -> None:
+        if torch.cuda.is_available():
+            # Stay on the socket closest to this device's PCIe root
+            _set_device_cpu_affinity(self.device)
+            torch.cuda.set_device(self.device)
+        while not self._stopped:
+            task, stream = self._pop_local(), self.stream
+            if task is None:
+                task, stream = self._steal()
+            if task is not None:
+                task.run(stream)
+                continue
+            self._ready.wait(timeout=0.001)
+            self._ready.clear()
+
+    def _pop_local(self) -> Union[_Task, None]:
+        with self._lock:
+            if len(self._local) > 0:
+                return self._local.popleft()
+        return None
+
+    def _steal(self) -> Tuple[Union[_Task, None], Union[any, None]]:
+        # Stolen work keeps the victim's stream: the task's module lives on
+        # the victim's device, and the completion event must be recorded
+        # where the kernels run for join() to mean the device work finished
+        for peer in self.peers:
+            with peer._lock:
+                if len(peer._local) > 0:
+                    return peer._local.popleft(), peer.stream
+        return None, None
+
+    def submit(self, fn: Callable) -> _Task:
+        """Queue a function for execution on this device's thread.
+
+        Args:
+            fn (Callable): Zero-argument closure to run.
+
+        Returns:
+            _Task: Joinable handle for the queued work.
+        """
+        ev = None
+        if torch.cuda.is_available():
+            # The submitter issued the argument H2D copies on its current
+            # stream; the task stream must not start until they land
+            ev = torch.cuda.Event()
+            ev.record(torch.cuda.current_stream(self.device))
+        task = _Task(fn, ev)
+        with self._lock:
+            self._local.append(task)
+        self._ready.set()
+        return task
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._ready.set()
+        self._thread.join()
+
+
+class _StepGraph:
+    """Captured CUDA graph for one particle's training step at fixed shapes.
+
+    Holds the static input/label/loss tensors the graph was recorded against;
+    replays copy new data into the static buffers and re-run the recording.
+    """
+    __slots__ = ("graph", "static_data", "static_label", "static_loss", "warmups", "broken")
+
+    def __init__(self) -> None:
+        self.graph = None         # captured torch.cuda.CUDAGraph
+        self.static_data = None   # input buffer the graph reads
+        self.static_label = None  # label buffer the graph reads
+        self.static_loss = None   # loss tensor the graph writes
+        self.warmups = 0          # eager iterations before capture
+        self.broken = False       # capture failed; stay eager for this key
+
+
+class _ParticleInfo:
+    """Per-particle record: rank, device, user state, hooks, and open futures.
+
+    Hot paths (send/broadcast/dispatch) resolve one lookup on this record
+    instead of one dict hit per attribute.
+    """
+    __slots__ = ("rank", "device", "state", "hooks", "futures")
+
+    def __init__(self, rank: int, device: int, state: dict) -> None:
+        self.rank = rank          # rank holding the particle
+        self.device = device      # device holding the particle
+        self.state = state        # user state
+        self.hooks = {}           # Type: msg -> closure, for triggering events
+        self.futures = set()      # open fids on this particle
+
+
 class NodeEventLoop(Waitable):
     """The Node Event Loop (NEL) is the main event loop for a node.
 
@@ -35,6 +244,10 @@ class NodeEventLoop(Waitable):
             Size of particle cache.
         view_size (int): 
             Size of view cache.
+        f_cuda_graphs (bool):
+            Capture particle training steps as CUDA graphs once shapes stabilize.
+        device_policy (str):
+            Device eviction policy, "2q" or "lru".
     """
 
     def __init__(self,
@@ -45,7 +258,9 @@ class NodeEventLoop(Waitable):
                  rank: int,
                  devices: int,
                  cache_size: int,
-                 view_size: int) -> None:
+                 view_size: int,
+                 f_cuda_graphs=False,
+                 device_policy="2q") -> None:
         """
         Initialize the NodeEventLoop.
 
@@ -66,6 +281,10 @@ class NodeEventLoop(Waitable):
                 Size of particle cache.
             view_size (int): 
                 Size of view cache.
+            f_cuda_graphs (bool):
+                Capture particle training steps as CUDA graphs once shapes stabilize.
+            device_policy (str):
+                Device eviction policy, "2q" or "lru".
         """
         # Node information
         self.rank = rank                         # Rank of NEL
@@ -80,26 +299,61 @@ class NodeEventLoop(Waitable):
         self._out_queues = {}                    # Type: pid -> mp.Queue
 
         # Particle information
-        self._particle_to_rank = {}              # Type: pid -> rank
+        self._particle_info = {}                 # Type: pid -> _ParticleInfo, one lookup on hot paths
         self._particle_to_device = {}            # Type: pid -> device
-        self._particle_to_state = {}             # Type: pid -> state
-        self._hooks = {}                         # Type: pid -> msg -> closure, for triggering events
+        self._device_of_pid = []                 # Dense pid -> device map for the dispatch hot path
 
         # Device management
-        self._device_to_pthread = OrderedDict()  # Type: device -> (pid, thread)
+        self._device_to_pthread = mk_device_policy(device_policy)  # active (pid, thread) per device
         self.particle_caches = {}                # Type: device -> cache, particle caches on this NEL
         self.view_caches = {}                    # Type: device -> cache, cross-device view caches on this NEL
         for device in devices:
             self.particle_caches[device] = ParticleCache(mk_module, args, cache_size, device, threading.Lock())
-            self.view_caches[device] = ParticleCache(mk_module, args, view_size, device, threading.Lock())
+            self.view_caches[device] = ARCParticleCache(mk_module, args, view_size, device, threading.Lock())
+        self._device_workers = {}                # Type: device -> _DeviceWorker
+        for device in devices:
+            self._device_workers[device] = _DeviceWorker(device)
+        for device, worker in self._device_workers.items():
+            # Nearest devices first as a proxy for interconnect distance
+            worker.peers = [self._device_workers[d] for d in
+                            sorted((d for d in devices if d != device), key=lambda d: abs(d - device))]
         
         # Futures state for particles on this event loop
         self._future_id = 0                      # Type: fid, future id
-        self._particle_to_futures = {}           # Type: pid -> set[fid]
         self._future_to_particle = {}            # Type: fid -> pid
         
-        self._results = {}                       # Type: fid -> result
-        self._results_lock = threading.Lock()
+        self._futures = {}                       # Type: fid -> Future, set wait-free by worker threads
+
+        # CUDA graph capture for training steps (opt-in)
+        self._f_cuda_graphs = f_cuda_graphs and torch.cuda.is_available()
+        self._step_graphs = {}                   # Type: (pid, data shape, label shape) -> _StepGraph
+
+        # Cached parameter lists and view objects for the get paths. Entries
+        # carry the module they were built from and are rebuilt whenever a
+        # cache hands back a different module (eviction, reload).
+        self._owner_params = {}                  # Type: pid -> (module, param list)
+        self._view_params = {}                   # Type: (device, pid) -> (module, param list)
+        self._view_objs = {}                     # Type: (device, pid) -> ParticleView
+
+        # Staging buffers for ReceiveGetMSG, allocated once per (pid, caller)
+        # so concurrent callers never overwrite each other's unread buffers
+        self._get_stage = {}                     # Type: (pid, caller) -> (param bufs, grad bufs)
+        self._get_stage_sent = {}                # Type: (pid, caller) -> grad presence signature
+        self._remote_get_stage = {}              # Type: (pid, caller) -> (params, grads) staged by the owner
+
+        # Dispatch table indexed by MSG.TAG. The trailing slot stays None so
+        # the base tag of -1 falls through to "no handler".
+        self._dispatch_table = [None] * (NUM_MSG_TAGS + 1)
+        self._dispatch_table[ReceiveFuncMSG.TAG] = self._handle_receive_func
+        self._dispatch_table[ReceiveFuncBroadcastMSG.TAG] = self._handle_receive_func_broadcast
+        self._dispatch_table[ReceiveGetMSG.TAG] = self._handle_receive_get
+        self._dispatch_table[ReceiveParametersPDMSG.TAG] = self._handle_receive_parameters
+        self._dispatch_table[ReceiveRegisterPDMSG.TAG] = self._handle_receive_register
+        self._dispatch_table[ReceiveParticleInitPDMSG.TAG] = self._handle_receive_particle_init
+        self._dispatch_table[NELSaveModel.TAG] = self._handle_save_model
+        self._dispatch_table[NELBroadcastParticlesMSG.TAG] = self._handle_broadcast_particles
+        self._dispatch_table[NodeEvtLoopCleanupMSG.TAG] = self._handle_cleanup
+        self._dispatch_table[ReceiveFuncPDMSG.TAG] = self._handle_receive_func_pd
 
     # -----------------------------------------------------
     # Context switching
@@ -112,11 +366,15 @@ class NodeEventLoop(Waitable):
         Args:
             pid (int): Particle identifier.
         """
-        pid_device = self._particle_to_device[pid]
+        pid_device = self._device_of_pid[pid]
         if pid_device in self._device_to_pthread:
+            if self._device_to_pthread.active_pid(pid_device) == pid:
+                # Back-to-back reuse of the resident particle (e.g. repeated
+                # steps) is the recency signal the eviction policy keys on
+                self._device_to_pthread.touch(pid_device)
             # If device is in use, finish execution of active particle that is using that device
             active_pid, active_thread = self._device_to_pthread.pop(pid_device)
-            active_pid_device = self._particle_to_device[active_pid]
+            active_pid_device = self._device_of_pid[active_pid]
             self.particle_caches[active_pid_device].release(active_pid, active_thread)
 
     def _context_switch_module(self, pid: int, pin=False, msg=None) -> nn.Module:
@@ -131,7 +389,7 @@ class NodeEventLoop(Waitable):
         Returns:
             nn.Module: The module associated with the particle.
         """
-        pid_device = self._particle_to_device[pid]
+        pid_device = self._device_of_pid[pid]
         
         # Try read
         self._wait_particle_thread(pid)
@@ -140,9 +398,8 @@ class NodeEventLoop(Waitable):
         # Try reload module
         while module is None:
             # If module read fails, finish execution of active particle that is using that device
-            active_pid, active_thread = self._device_to_pthread.popitem(last=False)
-            active_pid_device = self._particle_to_device[active_pid]
-            self.particle_caches[active_pid_device].release(active_pid, active_thread)
+            active_device, active_pid, active_thread = self._device_to_pthread.evict()
+            self.particle_caches[active_device].release(active_pid, active_thread)
             
             # Try reload module
             module = self.particle_caches[pid_device].try_read(pid, pin=pin)
@@ -157,10 +414,14 @@ class NodeEventLoop(Waitable):
         Start the Node Event Loop.
         """
         go = True
+        get_many = self.in_queue.get_many
+        dispatch = self._dispatch
         while go:
-            # Obtain message and dispatch
-            msg = self.in_queue.get()
-            go = self._dispatch(msg)
+            # Drain pending messages in batches to amortize queue overhead
+            for msg in get_many():
+                go = dispatch(msg)
+                if not go:
+                    break
 
     def _dispatch(self, msg: MSG) -> bool:
         """
@@ -172,120 +433,227 @@ class NodeEventLoop(Waitable):
         Returns:
             bool: True if the loop should continue, False otherwise.
         """
-        # -----------------------------------------------------
-        # Particle functionality
-        # -----------------------------------------------------
-        
-        if isinstance(msg, ReceiveFuncMSG):
-            # Handle message
-            sender, pid, msg_name = msg.pid_fid, msg.pid, msg.msg_name
-            if msg_name in self._hooks[pid]:
-                fn = self._hooks[pid][msg_name]
-                state = self._particle_to_state[pid]
-                pid_device = self._particle_to_device[pid]
-                self._context_switch_module(pid, msg='ReceiveFuncMsg')
-                particle = Particle(self, pid_device, pid, module, state)
-                args = [detach_to_device(pid_device, arg) for arg in msg.args]
-                fn(particle, *args)
-
-        elif isinstance(msg, ReceiveGetMSG):
-            # Handle message
-            pid_device = self._particle_to_device[msg.pid]
-            module = self._context_switch_module(pid)
-            params = []
-            params_grad = []
-            for p in module.parameters():
-                params += [p.detach().clone().cpu()]
-                params_grad += [p.grad.detach().clone().cpu() if p.grad is not None else None]
-            
-            # Acknowledge
-            caller_pid_device = self._particle_to_device[msg.pid_caller]
-            self._in_queues[caller_pid_device].put(ReceiveGetAckMSG(msg.pid_fid, msg.pid, params, params_grad))
+        # Error paths put raw exceptions on the queues; tolerate non-MSG
+        # objects the way the isinstance chain did
+        tag = getattr(msg, "TAG", None)
+        if tag is None:
+            return True
+        handler = self._dispatch_table[tag]
+        if handler is None:
+            return True
+        return handler(msg)
 
-        # -----------------------------------------------------
-        # PNN functionality
-        # -----------------------------------------------------
+    # -----------------------------------------------------
+    # Particle functionality
+    # -----------------------------------------------------
 
-        elif isinstance(msg, ReceiveParametersPDMSG):
-            # Handle message
-            pid_device = self._particle_to_device[msg.pid]
-            module = self._context_switch_module(msg.pid)
-            params = [x.detach().to("cpu") for x in module.parameters()]
+    def _handle_receive_func(self, msg: ReceiveFuncMSG) -> bool:
+        sender, pid, msg_name = msg.pid_fid, msg.pid, msg.msg_name
+        info = self._particle_info[pid]
+        if msg_name in info.hooks:
+            fn = info.hooks[msg_name]
+            pid_device = info.device
+            module = self._context_switch_module(pid, msg='ReceiveFuncMsg')
+            particle = Particle(self, pid_device, pid, module, info.state)
+            args = [detach_to_device(pid_device, arg) for arg in msg.args]
+            fn(particle, *args)
+        return True
+
+    def _handle_receive_func_broadcast(self, msg: ReceiveFuncBroadcastMSG) -> bool:
+        args_on_device = {}  # Type: device -> args, detached once and shared by receivers
+        for pid, fid in msg.pid_fids:
+            info = self._particle_info[pid]
+            if msg.msg_name in info.hooks:
+                fn = info.hooks[msg.msg_name]
+                pid_device = info.device
+                module = self._context_switch_module(pid, msg='ReceiveFuncBroadcastMSG')
+                particle = Particle(self, pid_device, pid, module, info.state)
+                if pid_device not in args_on_device:
+                    args_on_device[pid_device] = [detach_to_device(pid_device, arg) for arg in msg.args]
+                fn(particle, *args_on_device[pid_device])
+        return True
+
+    def _owner_param_list(self, pid: int, module: nn.Module) -> List[torch.Tensor]:
+        """Returns the cached parameter list for a particle's own module.
 
-            # Acknowledge
-            self.out_queue.put(ReceiveParametersAckPDMSG(msg.pid_fid, params))
+        Args:
+            pid (int): Particle identifier.
+            module (nn.Module): The module the particle cache handed back.
 
-        elif isinstance(msg, ReceiveRegisterPDMSG):
-            # Handle message
-            self._hooks[msg.pid][msg.msg] = msg.fn
+        Returns:
+            List[torch.Tensor]: The module's parameters, traversed once.
+        """
+        cached = self._owner_params.get(pid)
+        if cached is not None and cached[0] is module:
+            return cached[1]
+        params = list(module.parameters())
+        self._owner_params[pid] = (module, params)
+        return params
 
-            # Acknowledge
-            self.out_queue.put(ReceiveRegisterAckPDMSG())
-
-        elif isinstance(msg, ReceiveParticleInitPDMSG):
-            # Handle message
-            self._particle_to_rank[msg.pid] = self.rank       # set rank
-            self._particle_to_device[msg.pid] = msg.device    # set device
-            module = self.particle_caches[self._particle_to_device[msg.pid]].create(msg.pid, msg.mk_optim, msg.mk_scheduler, msg.prior, msg.train_key)
-            self._particle_to_state[msg.pid] = msg.state
-            
-            # Register receives
-            self._hooks[msg.pid] = {}
-            for recv_msg, fn in msg.receive.items():
-                self._hooks[msg.pid][recv_msg] = fn
-            self._particle_to_futures[msg.pid] = set()
+    def _view_state(self, device: int, pid: int, module: nn.Module) -> Tuple[List[torch.Tensor], ParticleView]:
+        """Returns the cached parameter list and view object for a view module.
 
-            # Acknowledge
-            self.out_queue.put(ReceiveParticleInitAckPDMSG())
+        Args:
+            device (int): Device holding the view.
+            pid (int): Particle identifier the view mirrors.
+            module (nn.Module): The module the view cache handed back.
 
-        elif isinstance(msg, NELSaveModel):
-            # Handle message
-            for pid, pid_device in self._particle_to_device.items():
-                self.particle_caches[pid_device].save_to_disk(pid)
+        Returns:
+            Tuple[List[torch.Tensor], ParticleView]: Parameters and lazy view.
+        """
+        key = (device, pid)
+        cached = self._view_params.get(key)
+        if cached is not None and cached[0] is module:
+            return cached[1], self._view_objs[key]
+        params = list(module.parameters())
+        view = ParticleView(self.view_caches[device], pid)
+        self._view_params[key] = (module, params)
+        self._view_objs[key] = view
+        return params, view
+
+    def _handle_receive_get(self, msg: ReceiveGetMSG) -> bool:
+        pid_device = self._device_of_pid[msg.pid]
+        module = self._context_switch_module(msg.pid)
+
+        # Stage into per-(pid, caller) shared-memory buffers allocated on
+        # first use: the ack carries handles rather than payloads, and the
+        # copies are issued non-blocking with a single synchronize instead of
+        # one stream stall per parameter. Keying by caller too keeps
+        # concurrent gets from overwriting buffers another caller has not
+        # consumed yet.
+        srcs = self._owner_param_list(msg.pid, module)
+        key = (msg.pid, msg.pid_caller)
+        if key not in self._get_stage:
+            bufs = [torch.empty_like(p, device="cpu").share_memory_() for p in srcs]
+            self._get_stage[key] = (bufs, [None] * len(srcs))
+        bufs, gbufs = self._get_stage[key]
+        params = bufs
+        for i, p in enumerate(srcs):
+            if p.grad is not None and gbufs[i] is None:
+                gbufs[i] = torch.empty_like(p, device="cpu").share_memory_()
+        # Two fused launches rather than one copy per parameter
+        bulk_copy_(bufs, [p.detach() for p in srcs], non_blocking=True)
+        bulk_copy_([g for g, p in zip(gbufs, srcs) if p.grad is not None],
+                   [p.grad.detach() for p in srcs if p.grad is not None],
+                   non_blocking=True)
+        params_grad = [g if p.grad is not None else None for g, p in zip(gbufs, srcs)]
+        if torch.cuda.is_available():
+            torch.cuda.synchronize(pid_device)
+
+        # Ship the staging tensors only when the receiver has not seen them
+        # (or gradient buffers appeared); afterwards the ack is handle-free
+        # and the receiver reuses its cached shared tensors.
+        sig = tuple(p.grad is not None for p in srcs)
+        if self._get_stage_sent.get(key) == sig:
+            params, params_grad = None, None
+        else:
+            self._get_stage_sent[key] = sig
 
-            # Acknowledge
-            self.out_queue.put(NELSaveModelAckPDMSG(msg.pid_fid))
+        # Acknowledge
+        caller_pid_device = self._device_of_pid[msg.pid_caller]
+        self._in_queues[caller_pid_device].put(ReceiveGetAckMSG(msg.pid_fid, msg.pid, params, params_grad))
+        return True
+
+    # -----------------------------------------------------
+    # PNN functionality
+    # -----------------------------------------------------
 
-        # -----------------------------------------------------
-        # Node Event Loop Functionality
-        # -----------------------------------------------------
+    def _handle_receive_parameters(self, msg: ReceiveParametersPDMSG) -> bool:
+        pid_device = self._device_of_pid[msg.pid]
+        module = self._context_switch_module(msg.pid)
+        params = [x.detach() for x in module.parameters()]
+        if len(params) > 0 and all(p.dtype == params[0].dtype for p in params):
+            # One contiguous bucket: a single D2H copy and one queued tensor
+            flat, shapes = flatten_params(params)
+            flat = flat.cpu().share_memory_()
+        else:
+            flat, shapes = [to_shared_cpu(x) for x in params], None
 
-        elif isinstance(msg, NELBroadcastParticlesMSG):
-            # Handle message
-            self._in_queues = msg.in_queues
-            self._out_queues = msg.out_queues
-            self._particle_to_device = msg.particle_to_device
+        # Acknowledge
+        self.out_queue.put(ReceiveParametersAckPDMSG(msg.pid_fid, flat, shapes))
+        return True
 
-            # Acknowledge
-            self.out_queue.put(NELBroadcastParticlesAckMSG())
+    def _handle_receive_register(self, msg: ReceiveRegisterPDMSG) -> bool:
+        self._particle_info[msg.pid].hooks[msg.msg] = msg.fn
 
-        elif isinstance(msg, NodeEvtLoopCleanupMSG):
-            return False
+        # Acknowledge
+        self.out_queue.put(ReceiveRegisterAckPDMSG())
+        return True
 
-        # -----------------------------------------------------
-        # PNN - particle functionality
-        # -----------------------------------------------------
-        
-        elif isinstance(msg, ReceiveFuncPDMSG):
-            # Handle message
-            sender, pid, msg_name = msg.pid_fid, msg.pid_to, msg.msg
-            if msg_name in self._hooks[pid]:
-                fn = self._hooks[pid][msg_name]
-                state = self._particle_to_state[pid]
-                pid_device = self._particle_to_device[pid]
-                module = self._context_switch_module(pid)
-                particle = Particle(self, pid_device, pid, module, state)
-                try:
-                    y = fn(particle, *msg.args)
-                except Exception as e:
-                    self.out_queue.put(e)
-                    self._cleanup()
-                    raise e
-                
-                # Acknowledge
-                self.out_queue.put(ReceiveFuncAckPDMSG(sender, y))
+    def _handle_receive_particle_init(self, msg: ReceiveParticleInitPDMSG) -> bool:
+        info = _ParticleInfo(self.rank, msg.device, msg.state)
+        self._particle_info[msg.pid] = info
+        self._particle_to_device[msg.pid] = msg.device    # set device
+        while len(self._device_of_pid) <= msg.pid:
+            self._device_of_pid += [-1]
+        self._device_of_pid[msg.pid] = msg.device
+        module = self.particle_caches[msg.device].create(msg.pid, msg.mk_optim, msg.mk_scheduler, msg.prior, msg.train_key)
+
+        # Register receives
+        info.hooks.update(msg.receive)
+
+        # Acknowledge
+        self.out_queue.put(ReceiveParticleInitAckPDMSG())
+        return True
 
-        return True        
+    def _handle_save_model(self, msg: NELSaveModel) -> bool:
+        for pid, pid_device in self._particle_to_device.items():
+            self.particle_caches[pid_device].save_to_disk(pid)
+
+        # Acknowledge
+        self.out_queue.put(NELSaveModelAckPDMSG(msg.pid_fid))
+        return True
+
+    # -----------------------------------------------------
+    # Node Event Loop Functionality
+    # -----------------------------------------------------
+
+    def _handle_broadcast_particles(self, msg: NELBroadcastParticlesMSG) -> bool:
+        self._in_queues = msg.table.in_queues
+        self._out_queues = msg.table.out_queues
+        self._particle_to_device = msg.table.particle_to_device
+        self._device_of_pid = msg.table.device_of_pid
+
+        # The broadcast can remap devices, so cached views, parameter lists,
+        # and get-staging state are stale
+        self._owner_params.clear()
+        self._view_params.clear()
+        self._view_objs.clear()
+        self._get_stage.clear()
+        self._get_stage_sent.clear()
+        self._remote_get_stage.clear()
+
+        # Acknowledge
+        self.out_queue.put(NELBroadcastParticlesAckMSG())
+        return True
+
+    def _handle_cleanup(self, msg: NodeEvtLoopCleanupMSG) -> bool:
+        for worker in self._device_workers.values():
+            worker.stop()
+        return False
+
+    # -----------------------------------------------------
+    # PNN - particle functionality
+    # -----------------------------------------------------
+
+    def _handle_receive_func_pd(self, msg: ReceiveFuncPDMSG) -> bool:
+        sender, pid, msg_name = msg.pid_fid, msg.pid_to, msg.msg
+        info = self._particle_info[pid]
+        if msg_name in info.hooks:
+            fn = info.hooks[msg_name]
+            pid_device = info.device
+            module = self._context_switch_module(pid)
+            particle = Particle(self, pid_device, pid, module, info.state)
+            try:
+                y = fn(particle, *msg.args)
+            except Exception as e:
+                self.out_queue.put(e)
+                self._cleanup()
+                raise e
+
+            # Acknowledge
+            self.out_queue.put(ReceiveFuncAckPDMSG(sender, y))
+        return True
 
     def _dispatch_receive_get_ack(self, msg: ReceiveGetAckMSG) -> None:
         """Handles the 'ReceiveGetAckMSG' message, creating or updating a particle on the device event loop.
@@ -297,21 +665,37 @@ class NodeEventLoop(Waitable):
             None
         """
         # Create particle on this device event loop if it doesn't exist
-        pid_device = self._particle_to_device[msg.pid]
+        pid_device = self._device_of_pid[msg.pid]
         if not self.view_caches[pid_device].contains(msg.pid):
             module = self.view_caches[pid_device].create(msg.pid, lambda x: None)
         else:
             module = self.view_caches[pid_device].read(msg.pid)
 
-        # Copy parameters over
-        for param, p, p_grad in zip(module.parameters(), msg.params, msg.params_grad):
-            with torch.no_grad():
-                param.copy_(p)
-            if p_grad is not None:
-                param.grad = p_grad.to(pid_device)
+        # Resolve the owner's staging tensors: sent at most once per
+        # (pid, caller), then cached
+        key = (msg.pid, self._future_to_particle[msg.fid])
+        if msg.params is None:
+            params, params_grad = self._remote_get_stage[key]
+        else:
+            params, params_grad = msg.params, msg.params_grad
+            self._remote_get_stage[key] = (params, params_grad)
+
+        # Copy parameters over; grads go into a persistent device buffer
+        # rather than allocating a new tensor per ack
+        dsts, view = self._view_state(pid_device, msg.pid, module)
+        for param, p_grad in zip(dsts, params_grad):
+            if p_grad is not None and param.grad is None:
+                param.grad = torch.empty_like(param)
+        with torch.no_grad():
+            bulk_copy_(dsts, params, non_blocking=True)
+            bulk_copy_([d.grad for d, g in zip(dsts, params_grad) if g is not None],
+                       [g for g in params_grad if g is not None],
+                       non_blocking=True)
+        if torch.cuda.is_available():
+            torch.cuda.synchronize(pid_device)
 
         # Return a lazy view
-        self._results[msg.fid] = ParticleView(self.view_caches[self._particle_to_device[msg.pid]], msg.pid)
+        self._set_result(msg.fid, view)
 
     def _wait(self, fid: int) -> any:
         """Waits for the result of a future with the specified ID.
@@ -327,45 +711,39 @@ class NodeEventLoop(Waitable):
         Note:
             This method may block the execution until the result becomes available.
         """
-        def check_results(fid: int):
-            """Check if the result for a specific future ID is available.
-
-            Args:
-                fid (int): The ID of the future to check.
-
-            Returns:
-                Tuple[bool, Optional[any]]: A tuple indicating whether the result is available
-                    and the result if available, or None if not available.
-            """
-            # Check to see if we already have the result
-            if fid in self._results:
-                result = self._results.pop(fid)
-                pid = self._future_to_particle.pop(fid)
-                self._particle_to_futures[pid].remove(fid)
-                return True, result
-            else:
-                return False, None
-
-        result = check_results(fid)
+        fut = self._futures[fid]
         msgs = []
-        while not result[0]:
-            msg = self.in_queue.get()
-            if isinstance(msg, ReceiveGetAckMSG):
-                self._dispatch_receive_get_ack(msg)
-                result = check_results(fid)
-            elif isinstance(msg, ReceiveFuncMSG) or isinstance(msg, ReceiveFuncPDMSG):
-                # Note: Handle this particles receive
-                #       Additional parallelism here if we are not on the same PID
-                msgs += [msg]
+        while not fut.done():
+            if self.in_queue.empty():
+                # Park on the future; worker threads publish through
+                # Future.set_result, which wakes the waiter without a shared lock
+                try:
+                    fut.result(timeout=0.001)
+                except FuturesTimeoutError:
+                    pass
             else:
-                # Dispatch PNN messages
-                go = self._dispatch(msg)
-        
+                # Drain pending messages in batches to amortize queue overhead
+                for msg in self.in_queue.get_many():
+                    # Message classes are final, so type identity replaces isinstance
+                    t = type(msg)
+                    if t is ReceiveGetAckMSG:
+                        self._dispatch_receive_get_ack(msg)
+                    elif t is ReceiveFuncMSG or t is ReceiveFuncPDMSG:
+                        # Note: Handle this particles receive
+                        #       Additional parallelism here if we are not on the same PID
+                        msgs += [msg]
+                    else:
+                        # Dispatch PNN messages
+                        go = self._dispatch(msg)
+
         # Dispatch buffered messages
         for msg in msgs:
             go = self._dispatch(msg)
-        
-        return result[1]
+
+        del self._futures[fid]
+        pid = self._future_to_particle.pop(fid)
+        self._particle_info[pid].futures.remove(fid)
+        return fut.result()
 
     def _cleanup(self) -> None:
         """Performs cleanup actions for the NodeEventLoop.
@@ -393,15 +771,34 @@ class NodeEventLoop(Waitable):
         self._future_id += 1
         return fid
 
-    def _register_future(self, pid: int, fid: int) -> None:
+    def _register_future(self, pid: int, fid: int) -> Future:
         """Registers a future for a particle with the given identifiers.
 
         Args:
             pid (int): Particle identifier.
             fid (int): Future identifier.
+
+        Returns:
+            Future: The future, so submitters can hand it to worker threads.
         """
-        self._particle_to_futures[pid].add(fid)
+        self._particle_info[pid].futures.add(fid)
         self._future_to_particle[fid] = pid
+        fut = Future()
+        self._futures[fid] = fut
+        return fut
+
+    def _set_result(self, fid: int, y: any) -> None:
+        """Publishes a future's result and wakes any waiter.
+
+        Called from device-worker threads as well as the event-loop thread;
+        `Future.set_result` is thread-safe and does not contend on any state
+        shared across futures.
+
+        Args:
+            fid (int): Future identifier.
+            y (any): The result.
+        """
+        self._futures[fid].set_result(y)
 
     # -----------------------------------------------------
     # Particle functionality
@@ -425,7 +822,11 @@ class NodeEventLoop(Waitable):
             state (dict): User state.
         """
 
-        self._hooks[pid][msg] = (fn, state)
+        # Hooks hold the bare closure (dispatch calls it directly); extra user
+        # state merges into the particle's state dict
+        info = self._particle_info[pid]
+        info.hooks[msg] = fn
+        info.state.update(state)
 
     def send(self, send_particle: Particle, pid_curr: int, pid: int, msg_name: str, *args: any) -> PFuture:
         """Sends a message to another particle for execution and returns a future.
@@ -445,18 +846,18 @@ class NodeEventLoop(Waitable):
         self._register_future(pid_curr, fid)
 
         # Check communication
-        rank_id_curr = self._particle_to_rank[pid_curr]
-        rank_id = self._particle_to_rank[pid]
+        rank_id_curr = self._particle_info[pid_curr].rank
+        info = self._particle_info[pid]
+        rank_id = info.rank
         if rank_id == rank_id_curr: # We are on the same rank
             # NOTE: INVARIANT: the current function always has it's module in scope
             module = self._context_switch_module(pid, msg=f'send {msg_name} from {pid_curr} to {pid}')
-            
+
             # NOTE: Execute function on main node event loop.
             #       Compute heavy items are run on separate threads.
-            fn = self._hooks[pid][msg_name]
-            state = self._particle_to_state[pid]
-            pid_device = self._particle_to_device[pid]
-            particle = Particle(self, pid_device, pid, module, state)
+            fn = info.hooks[msg_name]
+            pid_device = info.device
+            particle = Particle(self, pid_device, pid, module, info.state)
             args2 = [detach_to_device(pid_device, arg) for arg in args]
             try:
                 y = fn(particle, *args2)
@@ -464,7 +865,7 @@ class NodeEventLoop(Waitable):
                 self.out_queue.put(e)
                 self._cleanup()
                 raise e
-            self._results[fid] = y
+            self._set_result(fid, y)
 
             # NOTE: INVARIANT: the current function always has it's module in scope
             send_particle.module = self._context_switch_module(pid_curr, msg='send switch back')
@@ -479,6 +880,67 @@ class NodeEventLoop(Waitable):
             # Return future
             return PFuture(self, pid_curr, pid, fid)
 
+    def broadcast(self, send_particle: Particle, pid_curr: int, pids: List[int], msg_name: str, *args: any) -> List[PFuture]:
+        """Sends one message to many particles for execution and returns futures.
+
+        The arguments are detached once per device (and serialized once per rank)
+        instead of once per receiver as repeated `send` calls would do.
+
+        Args:
+            send_particle (Particle): Particle instance sending the message.
+            pid_curr (int): Identifier of the current particle.
+            pids (List[int]): Identifiers of the target particles.
+            msg_name (str): Name of the message to be executed.
+            *args: Variable length argument list for the message.
+
+        Returns:
+            List[PFuture]: Futures representing the results of the executions.
+        """
+        futures = []
+        rank_id_curr = self._particle_info[pid_curr].rank
+        args_on_device = {}    # Type: device -> args, detached once and shared by receivers
+        remote_pid_fids = {}   # Type: rank -> [(pid, fid)]
+        f_switched = False
+        for pid in pids:
+            # Create future
+            fid = self._create_future_id()
+            self._register_future(pid_curr, fid)
+            futures += [PFuture(self, pid_curr, pid, fid)]
+
+            # Check communication
+            info = self._particle_info[pid]
+            if info.rank == rank_id_curr: # We are on the same rank
+                # NOTE: INVARIANT: the current function always has it's module in scope
+                module = self._context_switch_module(pid, msg=f'broadcast {msg_name} from {pid_curr} to {pid}')
+                f_switched = True
+
+                fn = info.hooks[msg_name]
+                pid_device = info.device
+                particle = Particle(self, pid_device, pid, module, info.state)
+                if pid_device not in args_on_device:
+                    args_on_device[pid_device] = [detach_to_device(pid_device, arg) for arg in args]
+                try:
+                    y = fn(particle, *args_on_device[pid_device])
+                except Exception as e:
+                    self.out_queue.put(e)
+                    self._cleanup()
+                    raise e
+                self._set_result(fid, y)
+            else:
+                # Need to communicate; coalesce into one message per rank
+                remote_pid_fids.setdefault(info.rank, []).append((pid, fid))
+
+        if remote_pid_fids:
+            args2 = [detach_to_cpu(arg) for arg in args]
+            for rank_id, pid_fids in remote_pid_fids.items():
+                self._in_queues[rank_id].put(ReceiveFuncBroadcastMSG(pid_curr, pid_fids, msg_name, args2))
+
+        if f_switched:
+            # NOTE: INVARIANT: the current function always has it's module in scope
+            send_particle.module = self._context_switch_module(pid_curr, msg='broadcast switch back')
+
+        return futures
+
     def get(self, pid_curr: int, pid: int) -> PFuture:
         """Retrieves data from another particle and returns a future.
 
@@ -494,42 +956,54 @@ class NodeEventLoop(Waitable):
         self._register_future(pid_curr, fid)
 
         # Check communication
-        rank_id_curr = self._particle_to_rank[pid_curr]
-        rank_id = self._particle_to_rank[pid]        
+        info_curr = self._particle_info[pid_curr]
+        rank_id_curr = info_curr.rank
+        rank_id = self._particle_info[pid].rank
         if rank_id == rank_id_curr: # We are on the same rank
             # NOTE: INVARIANT: the current function always has its module in scope
             module = self._context_switch_module(pid, msg='get')
 
             # Create space for pid on pid_curr's device
-            device_curr = self._particle_to_device[pid_curr]
+            device_curr = info_curr.device
             if not self.view_caches[device_curr].contains(pid):
                 module_on_curr = self.view_caches[device_curr].create(pid, lambda x: None)
             else:
                 module_on_curr = self.view_caches[device_curr].try_read(pid)
 
             if True:
-                # Copy parameters over
-                for param, p in zip(module_on_curr.parameters(), module.parameters()):
-                    with torch.no_grad():
-                        param.copy_(p).to(device_curr)
-                    if p.grad is not None:
-                        param.grad = p.grad.to(device_curr)
-
-                self._results[fid] = ParticleView(self.view_caches[device_curr], pid)
+                # Copy parameters over. `param` already lives on device_curr so
+                # an in-place copy_ is the whole transfer; grads reuse a
+                # persistent buffer instead of allocating a fresh tensor.
+                dsts, view = self._view_state(device_curr, pid, module_on_curr)
+                srcs = self._owner_param_list(pid, module)
+                for param, p in zip(dsts, srcs):
+                    if p.grad is not None and param.grad is None:
+                        param.grad = torch.empty_like(param)
+                with torch.no_grad():
+                    bulk_copy_(dsts, srcs, non_blocking=True)
+                    bulk_copy_([d.grad for d, s in zip(dsts, srcs) if s.grad is not None],
+                               [s.grad for s in srcs if s.grad is not None],
+                               non_blocking=True)
+                if torch.cuda.is_available():
+                    torch.cuda.synchronize(device_curr)
+
+                self._set_result(fid, view)
                 return PFuture(self, pid_curr, pid, fid)
             else:
                 def worker(device_curr, module_on_curr, module):
                     for param, p in zip(module_on_curr.parameters(), module.parameters()):
                         with torch.no_grad():
-                            param.copy_(p).to(device_curr)
+                            param.copy_(p, non_blocking=True)
                         if p.grad is not None:
-                            param.grad = p.grad.to(device_curr)
+                            if param.grad is None:
+                                param.grad = torch.empty_like(param)
+                            param.grad.copy_(p.grad, non_blocking=True)
 
-                        self._results[fid] = ParticleView(self.view_caches[device_curr], pid)
+                        self._set_result(fid, ParticleView(self.view_caches[device_curr], pid))
 
                 # Launch thread
                 t = threading.Thread(target=worker, args=(device_curr, module_on_curr, module,))
-                self._device_to_pthread[device_curr] = (pid_curr, t)
+                self._device_to_pthread.insert(device_curr, pid_curr, t)
                 t.start()
                 # Return future
                 return PFuture(self, pid_curr, pid, fid, t=t)
@@ -569,23 +1043,19 @@ class NodeEventLoop(Waitable):
         """
         # Register future
         fid = self._create_future_id()
-        self._register_future(pid, fid)
-
-        def worker(module):
-            module.zero_grad()
-            self._results[fid] = None
+        fut = self._register_future(pid, fid)
 
         # Context switch
         module = self._context_switch_module(pid, msg='zero_grad')
 
-        # Launch thread
-        t = threading.Thread(target=worker, args=(module,))
-        pid_device = self._particle_to_device[pid]
-        self._device_to_pthread[pid_device] = (pid, t)
-        t.start()
+        # Pure metadata op: dropping the grad tensors costs less than a
+        # worker-thread hop, and the context switch above already joined any
+        # in-flight task on the particle's device
+        module.zero_grad(set_to_none=True)
+        fut.set_result(None)
 
         # Return future
-        return PFuture(self, pid, pid, fid, t=t)
+        return PFuture(self, pid, pid, fid)
 
     def forward(self, pid: int, x: torch.Tensor, *args: any) -> PFuture:
         """Executes the forward pass of the particle's module.
@@ -600,13 +1070,13 @@ class NodeEventLoop(Waitable):
         """
         # Register future
         fid = self._create_future_id()
-        self._register_future(pid, fid)
+        fut = self._register_future(pid, fid)
 
         # Functionality for forward
         def worker(module):
             try:
                 y = module.forward(x, *args)
-                self._results[fid] = y
+                fut.set_result(y)
             except Exception as e:
                 self.out_queue.put(e)
                 self._cleanup()
@@ -615,15 +1085,74 @@ class NodeEventLoop(Waitable):
         # Context switch
         module = self._context_switch_module(pid, msg='forward')
 
-        # Launch thread
-        t = threading.Thread(target=worker, args=(module,))
-        pid_device = self._particle_to_device[pid]
-        self._device_to_pthread[pid_device] = (pid, t)
-        t.start()
+        # Queue on the device's worker thread
+        pid_device = self._device_of_pid[pid]
+        t = self._device_workers[pid_device].submit(lambda: worker(module))
+        self._device_to_pthread.insert(pid_device, pid, t)
         
         # Return future
         return PFuture(self, pid, pid, fid, t=t)
 
+    def _graph_step(self, pid: int, module: nn.Module, optim: any, loss_fn: Callable,
+                    data: torch.Tensor, label: torch.Tensor, args: Tuple) -> Union[torch.Tensor, None]:
+        """Runs a particle's training step through a captured CUDA graph.
+
+        The first few steps per (pid, shapes) run eagerly to warm up kernels
+        and materialize gradient and optimizer state; the next one is recorded
+        against static input buffers and replayed from then on, so the GPU
+        sees the pre-recorded kernel stream with no per-step Python overhead.
+
+        Args:
+            pid (int): Identifier of the particle.
+            module (nn.Module): The particle's module.
+            optim (any): The particle's optimizer, possibly None.
+            loss_fn (Callable): Loss function used in the training step.
+            data (torch.Tensor): Input data for the training step.
+            label (torch.Tensor): Ground truth labels for the training step.
+            args (Tuple): Extra forward arguments.
+
+        Returns:
+            Union[torch.Tensor, None]: The loss, or None when this step must
+                run eagerly (warmup or a capture that failed).
+        """
+        key = (pid, tuple(data.shape), tuple(label.shape))
+        sg = self._step_graphs.get(key)
+        if sg is None:
+            sg = _StepGraph()
+            self._step_graphs[key] = sg
+        if sg.broken:
+            return None
+        if sg.graph is not None:
+            # Replay: only the input copies and the recorded kernels run
+            sg.static_data.copy_(data, non_blocking=True)
+            sg.static_label.copy_(label, non_blocking=True)
+            sg.graph.replay()
+            return sg.static_loss
+        if sg.warmups < _GRAPH_WARMUP:
+            sg.warmups += 1
+            return None
+        try:
+            sg.static_data = data.clone()
+            sg.static_label = label.clone()
+            graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(graph):
+                # Grad buffers must stay allocated across replays
+                module.zero_grad(set_to_none=False)
+                y = module.forward(sg.static_data, *args)
+                loss = loss_fn(y, sg.static_label)
+                loss.backward()
+                if optim:
+                    optim.step()
+            sg.graph = graph
+            sg.static_loss = loss
+            # Capture records without executing; replay to run this step
+            sg.graph.replay()
+            return sg.static_loss
+        except Exception:
+            # Capture constrains allowed ops; stay eager for this key
+            sg.broken = True
+            return None
+
     def step(self, pid: int, loss_fn: Callable, data: torch.Tensor, label: torch.Tensor, *args: any) -> PFuture:
         """Performs a training step, including forward and backward passes.
 
@@ -639,26 +1168,32 @@ class NodeEventLoop(Waitable):
         """
         # Register future
         fid = self._create_future_id()
-        self._register_future(pid, fid)
-        
+        fut = self._register_future(pid, fid)
+
         # Functionality for step
         def worker(module):
             try:
-                # Backwards pass
-                module.zero_grad()
+                pid_device = self._device_of_pid[pid]
+                optim = self.particle_caches[pid_device]._optim_cache[pid]
+
+                # Replay a captured graph when shapes are stable
+                if self._f_cuda_graphs and isinstance(data, torch.Tensor) and data.is_cuda:
+                    loss = self._graph_step(pid, module, optim, loss_fn, data, label, args)
+                    if loss is not None:
+                        fut.set_result(loss)
+                        return
+
+                # Backwards pass; set_to_none skips the grad-zeroing kernel
+                module.zero_grad(set_to_none=True)
                 y = module.forward(data, *args)
                 loss = loss_fn(y, label)
                 loss.backward()
 
                 # Optionally step
-                pid_device = self._particle_to_device[pid]
-                optim = self.particle_caches[pid_device]._optim_cache[pid]
-
                 if optim:
                     optim.step()
-                
-                # NOTE: Assumes that dictionary stores are atomic
-                self._results[fid] = loss
+
+                fut.set_result(loss)
             except Exception as e:
                 self.out_queue.put(e)
                 self._cleanup()
@@ -667,11 +1202,10 @@ class NodeEventLoop(Waitable):
         # Context switch
         module = self._context_switch_module(pid, pin=True, msg=f'step {pid}')
         
-        # Launch thread
-        t = threading.Thread(target=worker, args=(module,))
-        pid_device = self._particle_to_device[pid]
-        self._device_to_pthread[pid_device] = (pid, t)
-        t.start()
+        # Queue on the device's worker thread
+        pid_device = self._device_of_pid[pid]
+        t = self._device_workers[pid_device].submit(lambda: worker(module))
+        self._device_to_pthread.insert(pid_device, pid, t)
 
         # Return future
         return PFuture(self, pid, pid, fid, t=t)
@@ -691,16 +1225,17 @@ class NodeEventLoop(Waitable):
         """
         # Register future
         fid = self._create_future_id()
-        self._register_future(pid, fid)
-        
+        fut = self._register_future(pid, fid)
+
         # Functionality for step
         def worker(module):
             try:
                 # Optionally step
-                pid_device = self._particle_to_device[pid]
+                pid_device = self._device_of_pid[pid]
                 optim = self.particle_caches[pid_device]._optim_cache[pid]
                 scheduler = self.particle_caches[pid_device]._scheduler_cache[pid]
                 scheduler.step()
+                fut.set_result(None)
             except Exception as e:
                 self.out_queue.put(e)
                 self._cleanup()
@@ -709,11 +1244,10 @@ class NodeEventLoop(Waitable):
         # Context switch
         module = self._context_switch_module(pid, pin=True, msg=f'scheduler step {pid}')
         
-        # Launch thread
-        t = threading.Thread(target=worker, args=(module,))
-        pid_device = self._particle_to_device[pid]
-        self._device_to_pthread[pid_device] = (pid, t)
-        t.start()
+        # Queue on the device's worker thread
+        pid_device = self._device_of_pid[pid]
+        t = self._device_workers[pid_device].submit(lambda: worker(module))
+        self._device_to_pthread.insert(pid_device, pid, t)
 
         # Return future
         return PFuture(self, pid, pid, fid, t=t)
@@ -0,0 +1,211 @@
+import pickle
+import struct
+import time
+from multiprocessing import shared_memory
+from multiprocessing.reduction import ForkingPickler
+from typing import *
+
+
+# Frame markers. A frame is a little-endian u32 length followed by a pickled
+# payload. The markers use lengths that no real frame can have.
+_WRAP = 0xFFFFFFFF        # rest of the arena is padding; continue at offset 0
+_SIDE = 0xFFFFFFFE        # payload was too large for the arena; take one item
+                          # from the side channel instead
+
+_HEADER = 64              # head/tail counters padded out to a cache line each
+_U64 = struct.Struct("<Q")
+_U32 = struct.Struct("<I")
+
+
+class SharedRing:
+    """Single-producer single-consumer ring buffer over shared memory.
+
+    Messages are pickled into a byte arena backed by
+    `multiprocessing.shared_memory`, so passing a message costs one serialize
+    and one memcpy instead of the pipe write, lock acquisition, and extra
+    copies of `mp.Queue`. The producer publishes by advancing a monotonic
+    head counter and the consumer follows with a tail counter; with one
+    process on each side no lock is needed.
+
+    Messages larger than the arena fall back to a Manager queue side channel,
+    signalled in-band by a sentinel frame so ordering is preserved.
+
+    Args:
+        side_queue: Manager queue used as the overflow side channel.
+        capacity (int, optional): Size of the byte arena.
+    """
+
+    def __init__(self, side_queue, capacity: int = 1 << 22) -> None:
+        self._capacity = capacity
+        self._side = side_queue
+        self._shm = shared_memory.SharedMemory(create=True, size=2 * _HEADER + capacity)
+        self._owner = True
+        self._buf = self._shm.buf
+        self._write_counter(0, 0)          # head, written by the producer
+        self._write_counter(_HEADER, 0)    # tail, written by the consumer
+
+    # -----------------------------------------------------
+    # Pickling (reattach by name on the other side)
+    # -----------------------------------------------------
+
+    def __getstate__(self):
+        return (self._shm.name, self._capacity, self._side)
+
+    def __setstate__(self, state):
+        name, capacity, side = state
+        self._capacity = capacity
+        self._side = side
+        self._shm = shared_memory.SharedMemory(name=name)
+        self._owner = False
+        self._buf = self._shm.buf
+
+    # -----------------------------------------------------
+    # Counters
+    #
+    # Python offers no cross-process atomic store, so each counter is kept
+    # twice: the owner writes the value then its copy, and the other side
+    # rereads until both agree. A torn read then never passes as a new value,
+    # only (harmlessly) as a stale one.
+    # -----------------------------------------------------
+
+    def _read_counter(self, off: int) -> int:
+        while True:
+            copy = _U64.unpack_from(self._buf, off + 8)[0]
+            v = _U64.unpack_from(self._buf, off)[0]
+            if v == copy:
+                return v
+
+    def _write_counter(self, off: int, v: int) -> None:
+        _U64.pack_into(self._buf, off, v)
+        _U64.pack_into(self._buf, off + 8, v)
+
+    def _head(self) -> int:
+        return self._read_counter(0)
+
+    def _tail(self) -> int:
+        return self._read_counter(_HEADER)
+
+    def _set_head(self, v: int) -> None:
+        self._write_counter(0, v)
+
+    def _set_tail(self, v: int) -> None:
+        self._write_counter(_HEADER, v)
+
+    # -----------------------------------------------------
+    # Producer
+    # -----------------------------------------------------
+
+    def put(self, msg: any) -> None:
+        """Serialize a message into the ring. Blocks while the ring is full.
+
+        Args:
+            msg (any): Message to send.
+        """
+        payload = bytes(ForkingPickler.dumps(msg))
+        n = len(payload)
+        if 4 + n > self._capacity // 2:
+            # Oversized: ship through the side channel, keep ordering in-band
+            self._side.put(msg)
+            self._put_frame(_SIDE, b"")
+            return
+        self._put_frame(n, payload)
+
+    def _put_frame(self, n: int, payload: bytes) -> None:
+        cap = self._capacity
+        need = 4 + len(payload)
+        head = self._head()
+        while True:
+            pos = head % cap
+            rem = cap - pos
+            pad = rem if rem < need and rem >= 4 else 0
+            skip = rem if rem < 4 else 0
+            free = cap - (head - self._tail())
+            if free >= skip + pad + need:
+                break
+            time.sleep(0.0001)
+        pos = head % cap
+        rem = cap - pos
+        if rem < 4:
+            # Too small even for a marker; consumer skips this tail region
+            head += rem
+            pos = 0
+        elif rem < need:
+            _U32.pack_into(self._buf, 2 * _HEADER + pos, _WRAP)
+            head += rem
+            pos = 0
+        base = 2 * _HEADER + pos
+        _U32.pack_into(self._buf, base, n)
+        self._buf[base + 4:base + 4 + len(payload)] = payload
+        self._set_head(head + 4 + len(payload))
+
+    # -----------------------------------------------------
+    # Consumer
+    # -----------------------------------------------------
+
+    def empty(self) -> bool:
+        return self._head() == self._tail()
+
+    def get(self) -> any:
+        """Obtain the next message. Blocks while the ring is empty.
+
+        Returns:
+            any: The message.
+        """
+        spins = 0
+        while True:
+            msg, ok = self._try_get()
+            if ok:
+                return msg
+            # Spin briefly, then back off so an idle consumer does not burn a core
+            spins += 1
+            if spins > 1000:
+                time.sleep(0.0005)
+            elif spins > 100:
+                time.sleep(0)
+
+    def get_nowait(self) -> Tuple[any, bool]:
+        """Obtain the next message if one is ready.
+
+        Returns:
+            Tuple[any, bool]: The message (or None) and whether one was ready.
+        """
+        return self._try_get()
+
+    def _try_get(self) -> Tuple[any, bool]:
+        cap = self._capacity
+        while True:
+            tail = self._tail()
+            if self._head() == tail:
+                return None, False
+            pos = tail % cap
+            rem = cap - pos
+            if rem < 4:
+                self._set_tail(tail + rem)
+                continue
+            base = 2 * _HEADER + pos
+            n = _U32.unpack_from(self._buf, base)[0]
+            if n == _WRAP:
+                self._set_tail(tail + rem)
+                continue
+            if n == _SIDE:
+                self._set_tail(tail + 4)
+                return self._side.get(), True
+            payload = bytes(self._buf[base + 4:base + 4 + n])
+            self._set_tail(tail + 4 + n)
+            return pickle.loads(payload), True
+
+    # -----------------------------------------------------
+    # Cleanup
+    # -----------------------------------------------------
+
+    def close(self) -> None:
+        try:
+            self._buf = None
+            self._shm.close()
+            if self._owner:
+                self._shm.unlink()
+        except Exception:
+            pass
+
+    def __del__(self):
+        self.close()
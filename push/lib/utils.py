@@ -1,4 +1,5 @@
 import torch
+from torch.utils import _pytree as pytree
 from typing import *
 
 
@@ -35,16 +36,91 @@ def detach_to_device(device: int, val: Union[Dict, List, Tuple, torch.Tensor], r
     Returns:
         Union[Dict, List, torch.Tensor]: The detached and moved data structure.
     """
-    if isinstance(val, dict):
-        return {k: detach_to_device(device, v, requires_grad=requires_grad) for k, v in val.items()}
-    elif isinstance(val, list):
-        return [detach_to_device(device, v, requires_grad=requires_grad) for v in val]
-    elif isinstance(val, tuple):
-        return tuple(detach_to_device(device, v, requires_grad=requires_grad) for v in val)
-    elif isinstance(val, torch.Tensor):
-        return val.detach().requires_grad_().to(device) if requires_grad and isinstance(val, torch.FloatTensor) else val.detach().to(device)
-    else:
-        return val
+    def go(t: torch.Tensor) -> torch.Tensor:
+        if requires_grad and isinstance(t, torch.FloatTensor):
+            return t.detach().requires_grad_().to(device, non_blocking=True)
+        return t.detach().to(device, non_blocking=True)
+    # One C-level tree traversal; non_blocking lets multiple H2D copies overlap
+    return pytree.tree_map_only(torch.Tensor, go, val)
+
+
+def bulk_copy_(dsts: List[torch.Tensor], srcs: List[torch.Tensor], non_blocking=False) -> None:
+    """Copies `srcs` into `dsts` elementwise with one fused kernel launch.
+
+    `torch._foreach_copy_` issues the whole tensor list as a single foreach
+    op instead of one launch per parameter; older torch builds or unsupported
+    device combinations fall back to the plain loop.
+
+    Args:
+        dsts (List[torch.Tensor]): Destination tensors, written in place.
+        srcs (List[torch.Tensor]): Source tensors, same lengths and shapes.
+        non_blocking (bool): Whether cross-device copies may be asynchronous.
+    """
+    if len(dsts) == 0:
+        return
+    try:
+        torch._foreach_copy_(dsts, srcs, non_blocking=non_blocking)
+    except (AttributeError, TypeError, RuntimeError):
+        for d, s in zip(dsts, srcs):
+            d.copy_(s, non_blocking=non_blocking)
+
+
+def to_shared_cpu(t: torch.Tensor) -> torch.Tensor:
+    """Detaches a tensor to a CPU tensor backed by shared memory.
+
+    Tensors in shared memory cross process boundaries as a file-descriptor
+    handle instead of a pickled payload, so queueing them costs O(1) rather
+    than O(numel). The input is cloned first when it already lives on the CPU
+    so the live storage is not migrated.
+
+    Args:
+        t (torch.Tensor): The tensor to stage.
+
+    Returns:
+        torch.Tensor: A detached CPU tensor in shared memory.
+    """
+    cpu = t.detach().to("cpu")
+    if cpu.data_ptr() == t.data_ptr():
+        cpu = cpu.clone()
+    return cpu.share_memory_()
+
+
+def flatten_params(tensors: List[torch.Tensor]) -> Tuple[torch.Tensor, List[torch.Size]]:
+    """Flattens a list of tensors into one contiguous buffer.
+
+    A single large transfer beats many small ones, so parameter lists are
+    shipped as one flat tensor plus the shapes needed to unflatten.
+
+    Args:
+        tensors (List[torch.Tensor]): The tensors to flatten.
+
+    Returns:
+        Tuple[torch.Tensor, List[torch.Size]]: The flat buffer and per-tensor shapes.
+    """
+    shapes = [t.shape for t in tensors]
+    flat = torch._utils._flatten_dense_tensors(tuple(tensors))
+    return flat, shapes
+
+
+def unflatten_params(flat: torch.Tensor, shapes: List[torch.Size]) -> List[torch.Tensor]:
+    """Views a flat buffer produced by `flatten_params` as per-tensor views.
+
+    Args:
+        flat (torch.Tensor): The flat buffer.
+        shapes (List[torch.Size]): Per-tensor shapes.
+
+    Returns:
+        List[torch.Tensor]: Views into `flat`, one per original tensor.
+    """
+    outs = []
+    offset = 0
+    for shape in shapes:
+        n = 1
+        for d in shape:
+            n *= d
+        outs += [flat[offset:offset + n].view(shape)]
+        offset += n
+    return outs
 
 
 def detach_to_cpu(val: Union[Dict, List, torch.Tensor]) -> Union[Dict, List, torch.Tensor]:
@@ -56,11 +132,6 @@ def detach_to_cpu(val: Union[Dict, List, torch.Tensor]) -> Union[Dict, List, tor
     Returns:
         Union[Dict, List, torch.Tensor]: The detached and moved data structure to the CPU.
     """
-    if isinstance(val, dict):
-        return {k: detach_to_cpu(v) for k, v in val.items()}
-    elif isinstance(val, list):
-        return [detach_to_cpu(v) for v in val]
-    elif isinstance(val, torch.Tensor):
-        return val.detach().to("cpu")
-    else:
-        return val
+    # D2H copies stay blocking: a non_blocking copy into pageable memory can
+    # hand back a buffer before the transfer lands
+    return pytree.tree_map_only(torch.Tensor, lambda t: t.detach().to("cpu"), val)
@@ -71,6 +71,22 @@ class Particle(Waitable):
         """        
         return self._node_event_loop.send(self, self.pid, pid, msg, *args)
 
+    def broadcast(self, pids: List[int], msg: str, *args: any) -> List[PFuture]:
+        """Send a `msg` to every particle in `pids` with arguments `*args` from current particle.
+
+        Unlike issuing one `send` per particle, the arguments are shipped once
+        per device/rank and shared by all receivers on it.
+
+        Args:
+            pids (List[int]): Particle identifiers of receivers.
+            msg (str): Message.
+            *args (any): Any additional arguments to give to receivers.
+
+        Returns:
+            List[PFuture]: Handles to future results, one per receiver.
+        """
+        return self._node_event_loop.broadcast(self, self.pid, pids, msg, *args)
+
     def get(self, pid: int) -> PFuture:
         """Obtains particle `pid`'s parameters.
 
@@ -22,7 +22,8 @@ class PFuture:
         """        
         if self._t_or_ts is None:
             return self._waitable._wait(self._fid)
-        elif isinstance(self._t_or_ts, threading.Thread):
+        elif hasattr(self._t_or_ts, "join"):
+            # Thread or pooled device-worker task; both expose join()
             self._waitable._wait_particle_thread(self._recv_pid)
             return self._waitable._wait(self._fid)
         else:
@@ -1,6 +1,9 @@
+import queue
 import torch.multiprocessing as mp
 from typing import *
 
+from push.lib.spsc_ring import SharedRing
+
 
 class PQueue:
     def __init__(self) -> None:
@@ -8,10 +11,16 @@ class PQueue:
 
     def put(self, msg: any) -> None:
         raise NotImplementedError
-    
+
     def get(self) -> any:
         raise NotImplementedError
 
+    def get_many(self, max_msgs=64) -> List[any]:
+        raise NotImplementedError
+
+    def empty(self) -> bool:
+        raise NotImplementedError
+
 
 class SinglePQueue(PQueue):
     """Single-processing queue.
@@ -35,9 +44,24 @@ class SinglePQueue(PQueue):
 
         Returns:
             any: The message.
-        """        
+        """
         return self._queue.pop()
 
+    def get_many(self, max_msgs=64) -> List[any]:
+        """Obtain up to `max_msgs` pending messages, blocking for the first.
+
+        Returns:
+            List[any]: The messages.
+        """
+        # Same order as repeated `get` calls
+        msgs = []
+        while len(self._queue) > 0 and len(msgs) < max_msgs:
+            msgs += [self._queue.pop()]
+        return msgs
+
+    def empty(self) -> bool:
+        return len(self._queue) == 0
+
 
 class MultiPQueue(PQueue):
     """Multi-processing queue.
@@ -58,6 +82,67 @@ class MultiPQueue(PQueue):
 
         Returns:
             any: The message.
-        """        
+        """
         return self._queue.get()
-    
\ No newline at end of file
+
+    def get_many(self, max_msgs=64) -> List[any]:
+        """Obtain up to `max_msgs` pending messages, blocking for the first.
+
+        Returns:
+            List[any]: The messages.
+        """
+        msgs = [self._queue.get()]
+        while len(msgs) < max_msgs:
+            try:
+                msgs += [self._queue.get_nowait()]
+            except queue.Empty:
+                break
+        return msgs
+
+    def empty(self) -> bool:
+        return self._queue.empty()
+
+
+class RingPQueue(PQueue):
+    """Multi-processing queue over a shared-memory ring buffer.
+
+    Each queue has one producer and one consumer (PusH on one side, a Node
+    Event Loop on the other), so messages move through a lock-free
+    `SharedRing` instead of a Manager queue. Oversized messages overflow
+    into a Manager queue side channel inside the ring.
+    """
+    def __init__(self, manager: mp.Manager) -> None:
+        self._queue = SharedRing(manager.Queue())
+
+    def put(self, msg: any) -> None:
+        """Put a message on the queue. Does not block.
+
+        Args:
+            msg (any): Message to send to multi-processing queue.
+        """
+        self._queue.put(msg)
+
+    def get(self) -> any:
+        """Obtain a message from the queue. Blocking operation.
+
+        Returns:
+            any: The message.
+        """
+        return self._queue.get()
+
+    def get_many(self, max_msgs=64) -> List[any]:
+        """Obtain up to `max_msgs` pending messages, blocking for the first.
+
+        Returns:
+            List[any]: The messages.
+        """
+        msgs = [self._queue.get()]
+        while len(msgs) < max_msgs:
+            msg, ok = self._queue.get_nowait()
+            if not ok:
+                break
+            msgs += [msg]
+        return msgs
+
+    def empty(self) -> bool:
+        return self._queue.empty()
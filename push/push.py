@@ -7,7 +7,7 @@ from push.lib.node_event_loop import NodeEventLoop
 from push.lib.messages import *
 from push.lib.waitable import Waitable
 from push.pfuture import PFuture
-from push.pqueue import SinglePQueue, MultiPQueue
+from push.pqueue import SinglePQueue, MultiPQueue, RingPQueue
     
 
 def init_node_event_loop(mk_module: Callable,
@@ -17,8 +17,10 @@ def init_node_event_loop(mk_module: Callable,
                          rank: int,
                          devices: List[int],
                          cache_size: int,
-                         view_size: int) -> None:
-    nel = NodeEventLoop(mk_module, args, in_queues[rank], out_queues[rank], rank, devices, cache_size, view_size)
+                         view_size: int,
+                         f_cuda_graphs: bool,
+                         device_policy: str) -> None:
+    nel = NodeEventLoop(mk_module, args, in_queues[rank], out_queues[rank], rank, devices, cache_size, view_size, f_cuda_graphs=f_cuda_graphs, device_policy=device_policy)
     out_queues[rank].put(NodeEvtLoopInitMSG())
     nel._start_event_loop()
 
@@ -29,10 +31,12 @@ class PusH(Waitable):
     1. Create a Push Distribution which approximates a distribution on nn's parameters via *particles*.
     2. Create arbitrary number of particles (pinit). Particles execute concurrently of other particles
     """    
-    def __init__(self, mk_module: Callable, *args, cache_size=4, view_size=4, multi=False) -> None:
+    def __init__(self, mk_module: Callable, *args, cache_size=4, view_size=4, multi=False, f_cuda_graphs=False, device_policy="2q") -> None:
         # Model
         self.mk_module = mk_module
         self.args = args
+        self.f_cuda_graphs = f_cuda_graphs
+        self.device_policy = device_policy
 
         self.multi = multi
         if self.multi:
@@ -69,8 +73,8 @@ class PusH(Waitable):
             devices += [device_id]
         
         if self.multi:
-            self._in_queues[self.rank] = MultiPQueue(self._manager)
-            self._out_queues[self.rank] = MultiPQueue(self._manager)
+            self._in_queues[self.rank] = RingPQueue(self._manager)
+            self._out_queues[self.rank] = RingPQueue(self._manager)
         else:
             self._in_queues[self.rank] = SinglePQueue()
             self._out_queues[self.rank] = SinglePQueue()
@@ -88,11 +92,13 @@ class PusH(Waitable):
                     devices,
                     self.cache_size,
                     self.view_size,
+                    self.f_cuda_graphs,
+                    self.device_policy,
                 ))
             self._processes[self.rank] = p
             p.start()
         else:
-            self.nel = NodeEventLoop(self.mk_module, self.args, self._in_queues[self.rank], self._out_queues[self.rank], self.rank, devices, self.cache_size, self.view_size)
+            self.nel = NodeEventLoop(self.mk_module, self.args, self._in_queues[self.rank], self._out_queues[self.rank], self.rank, devices, self.cache_size, self.view_size, f_cuda_graphs=self.f_cuda_graphs, device_policy=self.device_policy)
             self._in_queues[self.rank]._nel = self.nel
             self._out_queues[self.rank]._nel = self.nel
             self._out_queues[self.rank].put(NodeEvtLoopInitMSG())
@@ -184,39 +190,74 @@ class PusH(Waitable):
         """        
         return len(self._particle_to_rank)
 
-    def p_create(self, mk_optim: Callable, mk_scheduler: Callable, prior = False, train_key = -1, device=0, receive={}, state={}) -> int:
+    def p_create(self, mk_optim: Callable, mk_scheduler: Callable, prior = False, train_key = -1, device=0, receive={}, state={}, f_broadcast=True) -> int:
         """Create a particle
 
         Args:
             mk_optim (Callable): Optimizer for updating parameters. Can be None.
             device (int, optional): Device to put particle on. Defaults to 0.
-            receive (dict, optional): 
+            receive (dict, optional):
                Dictionary containing messages that this particle will respond to.
                Defaults to {}.
+            f_broadcast (bool, optional):
+               Whether to broadcast particles immediately. Callers creating many
+               particles can pass False and call `p_broadcast` once at the end,
+               turning the O(particles) broadcast per create into a single one.
 
         Returns:
             int: Particle identifier.
-        """        
+        """
         # Create particle
         new_pid = len(self._particle_to_rank)
         self._particle_to_device[new_pid] = device
         self._particle_to_rank[new_pid] = self.rank
         self._particle_to_futures[new_pid] = []
         self._in_queues[self.rank].put(ReceiveParticleInitPDMSG(device, new_pid, mk_optim, mk_scheduler, prior, train_key, receive, state))
-        
+
         # Acknowledge
         msg = self._out_queues[self.rank].get()
         if not isinstance(msg, ReceiveParticleInitAckPDMSG):
             raise ValueError(f"Fatal error ... inconsistent message state")
 
-        # Broadcast so we can discover other particles
+        if f_broadcast:
+            self.p_broadcast()
+
+        return new_pid
+
+    def p_broadcast(self) -> None:
+        """Broadcast particles so they can discover each other.
+
+        Returns:
+            None.
+        """
         for pid, queue in self._in_queues.items():
             queue.put(NELBroadcastParticlesMSG(self._in_queues, self._out_queues, self._particle_to_device))
             msg = self._out_queues[pid].get()
             if not isinstance(msg, NELBroadcastParticlesAckMSG):
                 raise ValueError(f"Fatal error ... inconsistent message state")
-        
-        return new_pid
+
+    def p_register(self, pid: int, msg: str, fn: Callable, state={}) -> None:
+        """Register a receive handler on an existing particle.
+
+        Args:
+            pid (int): Identifier of particle to register the handler on.
+            msg (str): Message that the particle will respond to.
+            fn (Callable): Function to execute on `msg`.
+            state (dict, optional): User state. Defaults to {}.
+
+        Returns:
+            None.
+        """
+        if pid not in self._particle_to_rank:
+            raise ValueError(f"Particle {pid} does not exist")
+
+        rank = self._particle_to_rank[pid]
+        self._in_queues[rank].put(ReceiveRegisterPDMSG(pid, msg, fn, state))
+
+        # Acknowledge
+        y = self._out_queues[rank].get()
+        if not isinstance(y, ReceiveRegisterAckPDMSG):
+            raise ValueError(f"Fatal error ... inconsistent message state")
 
     def p_parameters(self, pid: int, sync=True) -> Union[int, Iterable[torch.Tensor]]:
         """_summary_